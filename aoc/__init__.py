@@ -0,0 +1 @@
+"""Shared code for the solutions of Advent of Code 2021"""
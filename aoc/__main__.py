@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+
+# # #
+# Command line interface to the tools for running all solutions
+#
+#   python -m aoc run --days 1-21
+#   python -m aoc run --timeout 10 --max-memory 1024
+#   python -m aoc imports
+#   python -m aoc batch 15 inputs/ -j 4 -o results.jsonl
+#   tail -f log.txt | python -m aoc follow 1 all --every 1000
+#   python -m aoc parallel 1 2 big.txt -j 4
+#   python -m aoc parallel 1 2 big.txt -j 8 --bench
+#   python -m aoc serve --days 1-21 &
+#   python -m aoc query 15 2 inputs/big.txt
+#   python -m aoc bench --days 15,20 --repeat 10 --baseline old.json
+#   python -m aoc slots --count 1000000
+#   python -m aoc variants --days 4,6,7,9,20 --sizes 100,200
+#   python -m aoc cache stats
+#   python -m aoc generate 15 500 -o big.txt
+#   python -m aoc scale --days 5,12 --sizes 100,200,400,800
+#
+
+import os
+import sys
+import argparse
+
+from aoc import runner
+from aoc import batch
+from aoc import bench
+from aoc import cache
+from aoc import generators
+from aoc import incremental
+from aoc import parallel
+from aoc import scaling
+from aoc import slots
+from aoc import variants
+from aoc import server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m aoc')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cmd = commands.add_parser(
+        'run', help='run solutions of many days in parallel')
+    cmd.add_argument('--days', help='days to run, for example: 1-21 or 1,3,5-7'
+                     ' (default: all)')
+    cmd.add_argument('--parts', help='parts to run: 1, 2 or 1-2 (default)')
+    cmd.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                     help='number of worker processes (default: all cores)')
+    cmd.add_argument('-v', '--verbose', action='store_true',
+                     help='show what the solutions print')
+    cmd.add_argument('--no-cache', action='store_true',
+                     help='solve again even if the answer is in the cache')
+    cmd.add_argument('--timeout', type=float,
+                     help='kill a part that runs longer than this many'
+                     ' seconds')
+    cmd.add_argument('--max-memory', type=int,
+                     help='limit address space of every part to this many'
+                     ' MiB')
+    cmd.add_argument('-o', '--output', help='save results to this JSON file')
+    cmd.set_defaults(func=runner.main)
+
+    cmd = commands.add_parser(
+        'imports', help='measure time of importing solution modules')
+    cmd.add_argument('--days', help='days to import, for example: 1-21'
+                     ' (default: all)')
+    cmd.set_defaults(func=runner.imports_main)
+
+    cmd = commands.add_parser(
+        'batch', help='solve many inputs of one day, results as JSON lines')
+    cmd.add_argument('day', type=int)
+    cmd.add_argument('inputs', help='directory with input files or a glob'
+                     ' pattern (quoted)')
+    cmd.add_argument('--parts', help='parts to run: 1, 2 or 1-2 (default)')
+    cmd.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                     help='number of worker processes (default: all cores)')
+    cmd.add_argument('--in-flight', type=int,
+                     help='max number of inputs being solved or waiting for'
+                     ' output (default: twice the number of jobs)')
+    cmd.add_argument('--unordered', action='store_true',
+                     help='write results as they arrive, not in the order'
+                     ' of the inputs')
+    cmd.add_argument('--fresh', action='store_true',
+                     help='solve every input in a new process')
+    cmd.add_argument('-o', '--output', help='file to write (default: stdout)')
+    cmd.set_defaults(func=batch.main)
+
+    cmd = commands.add_parser(
+        'follow', help='print the answer after every line of the input')
+    cmd.add_argument('day', type=int)
+    cmd.add_argument('part', choices=['1', '2', 'all'],
+                     help='part to solve, all for both at once')
+    cmd.add_argument('input', nargs='?', help='file to read (default: stdin)')
+    cmd.add_argument('--every', type=int, default=1,
+                     help='print the answer after every this many lines'
+                     ' and at the end (default: 1)')
+    cmd.set_defaults(func=incremental.main)
+
+    cmd = commands.add_parser(
+        'parallel', help='solve a large input in chunks in many processes')
+    cmd.add_argument('day', type=int)
+    cmd.add_argument('part', type=int)
+    cmd.add_argument('input', nargs='?',
+                     help='input file (default: the real input of the day)')
+    cmd.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                     help='number of worker processes (default: all cores)')
+    cmd.add_argument('--chunks', type=int,
+                     help='number of chunks (default: one per job)')
+    cmd.add_argument('-v', '--verbose', action='store_true',
+                     help='show time taken')
+    cmd.add_argument('--bench', action='store_true',
+                     help='compare throughput with the serial solution for'
+                     ' 1, 2, 4, ... up to JOBS processes')
+    cmd.add_argument('-n', '--repeat', type=int, default=3,
+                     help='runs of every solution with --bench, the best'
+                     ' counts (default: 3)')
+    cmd.set_defaults(func=parallel.main)
+
+    cmd = commands.add_parser(
+        'serve', help='keep solutions warm and answer queries over a Unix'
+        ' socket')
+    cmd.add_argument('--days', help='days to import and read inputs of at'
+                     ' start, for example: 1-21 (default: none, on demand)')
+    cmd.add_argument('--socket', help='path to the socket (default:'
+                     ' AOC_SOCKET or aoc-UID.sock in the temporary directory)')
+    cmd.set_defaults(func=server.serve_main)
+
+    cmd = commands.add_parser(
+        'query', help='ask the running server for answers')
+    cmd.add_argument('day', type=int, nargs='?')
+    cmd.add_argument('part', type=int, nargs='?',
+                     help='1 or 2 (default: both)')
+    cmd.add_argument('input', nargs='?', help='input file, - for stdin'
+                     ' (default: the real input of the day)')
+    cmd.add_argument('--socket', help='path to the socket (default:'
+                     ' AOC_SOCKET or aoc-UID.sock in the temporary directory)')
+    cmd.add_argument('--json', action='store_true',
+                     help='print whole records as JSON lines')
+    cmd.add_argument('-v', '--verbose', action='store_true',
+                     help='show timings')
+    cmd.add_argument('--stats', action='store_true',
+                     help='show what the server keeps')
+    cmd.add_argument('--stop', action='store_true', help='stop the server')
+    cmd.set_defaults(func=server.query_main)
+
+    cmd = commands.add_parser(
+        'bench', help='benchmark solutions with repeated runs')
+    cmd.add_argument('--days', help='days to run, for example: 1-21 or 1,3,5-7'
+                     ' (default: all)')
+    cmd.add_argument('--parts', help='parts to run: 1, 2 or 1-2 (default)')
+    cmd.add_argument('--warmup', type=int, default=1,
+                     help='number of runs before measuring (default: 1)')
+    cmd.add_argument('-n', '--repeat', type=int, default=5,
+                     help='number of measured runs (default: 5)')
+    cmd.add_argument('-j', '--jobs', type=int, default=1,
+                     help='number of benchmarks to run at the same time'
+                     ' (default: 1)')
+    cmd.add_argument('-o', '--output', help='save results to this JSON file')
+    cmd.add_argument('-b', '--baseline',
+                     help='JSON file with results to compare against')
+    cmd.add_argument('-t', '--threshold', type=float, default=10.0,
+                     help='flag slowdowns of median time larger than this'
+                     ' many percent (default: 10)')
+    cmd.add_argument('-v', '--verbose', action='store_true',
+                     help='show what the solutions print')
+    cmd.set_defaults(func=bench.main)
+
+    cmd = commands.add_parser(
+        'slots', help='compare memory and time of slotted model classes'
+        ' against dict-backed ones')
+    cmd.add_argument('-n', '--count', type=int, default=100000,
+                     help='number of instances of every class'
+                     ' (default: 100000)')
+    cmd.add_argument('-j', '--jobs', type=int, default=1,
+                     help='number of measurements to run at the same time'
+                     ' (default: 1)')
+    cmd.add_argument('-o', '--output', help='save results to this JSON file')
+    cmd.set_defaults(func=slots.main)
+
+    cmd = commands.add_parser(
+        'variants', help='cross-check and benchmark alternative'
+        ' implementations of the same part',
+        description='With the defaults (generated inputs of the two smallest'
+        ' sizes, 1 + 3 rounds) all days take about a minute and a half.'
+        ' Real inputs are much slower: --real takes several minutes, the'
+        ' \'sum\' variant of day 07 alone takes ~30 s per round.')
+    cmd.add_argument('--days', help='days to run, for example: 1-21 or 1,3,5-7'
+                     ' (default: all that have variants)')
+    cmd.add_argument('--parts', help='parts to run: 1, 2 or 1-2 (default)')
+    cmd.add_argument('--sizes', help='comma separated sizes of generated'
+                     ' inputs (default: two smallest sizes of the day)')
+    cmd.add_argument('--real', action='store_true',
+                     help='also solve the real input (default: generated'
+                     ' inputs only)')
+    cmd.add_argument('--warmup', type=int, default=1,
+                     help='number of rounds before measuring (default: 1)')
+    cmd.add_argument('-n', '--repeat', type=int, default=3,
+                     help='number of measured rounds (default: 3)')
+    cmd.add_argument('--seed', type=int, default=2021)
+    cmd.add_argument('-j', '--jobs', type=int, default=1,
+                     help='number of inputs to solve at the same time'
+                     ' (default: 1)')
+    cmd.add_argument('-o', '--output', help='save results to this JSON file')
+    cmd.set_defaults(func=variants.main)
+
+    cmd = commands.add_parser(
+        'cache', help='show statistics of the caches or clear them')
+    cmd.add_argument('action', choices=['stats', 'clear'])
+    cmd.add_argument('--kind', choices=['results', 'parsed', 'all'],
+                     default='all', help='which cache (default: all)')
+    cmd.add_argument('--days', help='clear cached answers of these days only')
+    cmd.set_defaults(func=cache.main)
+
+    cmd = commands.add_parser(
+        'generate', help='generate a synthetic input of given size')
+    cmd.add_argument('day', type=int)
+    cmd.add_argument('size', type=int)
+    cmd.add_argument('--seed', type=int, default=2021)
+    cmd.add_argument('-o', '--output', help='file to write (default: stdout)')
+    cmd.set_defaults(func=generators.main)
+
+    cmd = commands.add_parser(
+        'scale', help='measure time and memory against size of the input')
+    cmd.add_argument('--days', help='days to run, for example: 1-21 or 1,3,5-7'
+                     ' (default: all that have generators)')
+    cmd.add_argument('--parts', help='parts to run: 1, 2 or 1-2 (default)')
+    cmd.add_argument('--sizes', help='comma separated sizes of the inputs'
+                     ' (default: depends on the day)')
+    cmd.add_argument('--seed', type=int, default=2021)
+    cmd.add_argument('-j', '--jobs', type=int, default=1,
+                     help='number of measurements to run at the same time'
+                     ' (default: 1)')
+    cmd.add_argument('-o', '--output', help='save results to this JSON file')
+    cmd.set_defaults(func=scaling.main)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
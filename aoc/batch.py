@@ -0,0 +1,132 @@
+# # #
+# Solve many inputs of one day in a pool of processes
+#
+#   python -m aoc batch 15 inputs/ -j 4 -o results.jsonl
+#   python -m aoc batch 15 'inputs/*.txt' --unordered
+#
+# Every input gets one JSON line with the answers and timings (in seconds):
+#
+#   {"input": "inputs/a.txt", "p1": "602", "p2": "2935",
+#    "parse_p1": 0.001, "solve_p1": 0.08, ..., "error": null}
+#
+# Lines are written as soon as results arrive. At most <in_flight> inputs
+# are submitted to the pool at a time and the inputs are read by the workers,
+# so memory does not grow with the number of inputs. In ordered mode (the
+# default) results that arrive early wait for the earlier ones, and they also
+# count towards <in_flight>.
+#
+
+import io
+import os
+import sys
+import glob
+import json
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Iterator, Iterable
+
+from aoc import utils
+from aoc import runner
+
+
+def find_inputs(spec: str) -> List[str]:
+    """Return sorted paths to the input files given as a directory (all files
+    in it), a glob pattern or a single file"""
+    if os.path.isdir(spec):
+        return sorted(entry.path for entry in os.scandir(spec)
+                      if entry.is_file())
+    return sorted(fname for fname in glob.glob(spec) if os.path.isfile(fname))
+
+
+def solve_file(day: int, fname: str, parts=runner.PARTS) -> dict:
+    """Solve given parts of given day on the input from the file <fname>"""
+    res = {'input': fname, 'error': None}
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            module = runner.import_day(day)
+            lines = utils.load_input(fname)
+        except Exception as ex:
+            res['error'] = "{}: {}".format(type(ex).__name__, ex)
+            return res
+        for part in parts:
+            res[f"p{part}"] = None
+            try:
+                start = time.perf_counter()
+                # some solutions modify their input, give each part a copy
+                args = runner.prepare_args(module, list(lines), part)
+                res[f"parse_p{part}"] = time.perf_counter() - start
+                start = time.perf_counter()
+                res[f"p{part}"] = str(getattr(module, f"solve_p{part}")(*args))
+                res[f"solve_p{part}"] = time.perf_counter() - start
+            except Exception as ex:
+                res['error'] = "p{}: {}: {}".format(
+                    part, type(ex).__name__, ex)
+                break
+    return res
+
+
+def run(day: int, files: Iterable[str], parts=runner.PARTS,
+        jobs: int = None, in_flight: int = None, ordered: bool = True,
+        fresh: bool = False) -> Iterator[dict]:
+    """Solve the inputs from given files in a pool of <jobs> processes and
+    generate the results as they arrive (in the order of <files> if
+    <ordered>). With <fresh>, every input is solved in a new process, which
+    is slower but isolates solutions that keep state at module level."""
+    jobs = jobs or os.cpu_count()
+    in_flight = max(1, in_flight or 2 * jobs)
+    files = enumerate(files)
+    pending = {}  # future --> index of the input
+    arrived = {}  # index of the input --> result waiting for its turn
+    next_idx = 0
+
+    with ProcessPoolExecutor(max_workers=jobs,
+                             max_tasks_per_child=1 if fresh else None) as pool:
+
+        def submit() -> bool:
+            for idx, fname in files:
+                future = pool.submit(solve_file, day, fname, parts)
+                pending[future] = idx
+                return True
+            return False
+
+        while len(pending) < in_flight and submit():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = pending.pop(future)
+                if ordered:
+                    arrived[idx] = future.result()
+                else:
+                    yield future.result()
+            while next_idx in arrived:
+                yield arrived.pop(next_idx)
+                next_idx += 1
+            while len(pending) + len(arrived) < in_flight and submit():
+                pass
+
+
+def main(args) -> int:
+    files = find_inputs(args.inputs)
+    if not files:
+        print(f"No input files found: {args.inputs}", file=sys.stderr)
+        return 1
+    parts = runner.parse_days(args.parts) if args.parts else runner.PARTS
+
+    start = time.perf_counter()
+    errors = 0
+    with contextlib.ExitStack() as stack:
+        out = stack.enter_context(open(args.output, 'w')) \
+            if args.output else sys.stdout
+        for record in run(args.day, files, parts, args.jobs, args.in_flight,
+                          not args.unordered, args.fresh):
+            errors += record['error'] is not None
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    elapsed = time.perf_counter() - start
+
+    print("Day {:02d}: {} inputs, {} failed, wall time: {:.2f} s".format(
+        args.day, len(files), errors, elapsed), file=sys.stderr)
+    return 1 if errors else 0
@@ -0,0 +1,211 @@
+# # #
+# Statistical benchmarking of the solutions
+#
+# Each day/part is solved several times on the real input: first <warmup>
+# times without measuring, then <repeat> times measuring wall time of every
+# call to solve_p1/solve_p2. Memory (peak RSS and allocated blocks, see
+# aoc.memory) is measured over the measured runs. The results
+# (min/median/p95/stddev, memory) can be saved to a JSON file and compared
+# against a baseline produced by an earlier run.
+#
+#   python -m aoc bench --days 15,20 --repeat 10 --output new.json
+#   python -m aoc bench --days 15,20 --baseline old.json --threshold 10
+#
+
+import io
+import sys
+import json
+import time
+import math
+import platform
+import statistics
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+from aoc import utils
+from aoc import memory
+from aoc import runner
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of given values"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """Compute statistics of a sample of run times"""
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'p95': percentile(times, 95),
+        'mean': statistics.mean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def bench_part(day: int, part: int, warmup: int = 1, repeat: int = 5,
+               verbose: bool = False) -> dict:
+    """Benchmark given part of given day on the real input"""
+    res = {'day': day, 'part': part, 'answer': None, 'error': None,
+           'times': [], 'peak_rss': None, 'blocks': None, 'peak_blocks': None}
+    out = sys.stdout if verbose else io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            module = runner.import_day(day)
+            solve = getattr(module, f"solve_p{part}")
+            lines = utils.load_input(runner.input_file(day))
+
+            def solve_copy():
+                # some solutions modify their input, give each run a copy
+                args = runner.prepare_args(module, list(lines), part)
+                start = time.perf_counter()
+                answer = solve(*args)
+                return answer, time.perf_counter() - start
+
+            for _ in range(warmup):
+                solve_copy()
+            with memory.Meter() as meter:
+                for _ in range(repeat):
+                    answer, elapsed = solve_copy()
+                    res['times'].append(elapsed)
+            res.update(meter.as_dict())
+            res['answer'] = str(answer)
+            res.update(summarize(res['times']))
+        except Exception as ex:
+            res['error'] = "{}: {}".format(type(ex).__name__, ex)
+    return res
+
+
+def run(days: List[int], parts=runner.PARTS, warmup: int = 1,
+        repeat: int = 5, jobs: int = 1, verbose: bool = False) -> List[dict]:
+    """Benchmark given days and parts, each in a fresh process.
+    Running several benchmarks at the same time (<jobs> > 1) makes them
+    compete for CPU and memory bandwidth, therefore one at a time is default.
+    """
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(bench_part, day, part, warmup, repeat, verbose)
+                   for day in days for part in parts]
+        records = [future.result() for future in futures]
+    return records
+
+
+def make_report(records: List[dict], warmup: int, repeat: int) -> dict:
+    return {
+        'meta': {
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'warmup': warmup,
+            'repeat': repeat,
+        },
+        'results': records,
+    }
+
+
+def load_report(fname: str) -> dict:
+    with open(fname) as fd:
+        return json.load(fd)
+
+
+def save_report(report: dict, fname: str):
+    with open(fname, 'w') as fd:
+        json.dump(report, fd, indent=2)
+        fd.write('\n')
+
+
+def compare(records: List[dict], baseline: dict,
+            threshold: float) -> List[dict]:
+    """Compare median times and peak RSS of <records> against the <baseline>
+    report. Every record gets the keys 'baseline' (baseline median or None),
+    'change' (relative change of the median) and 'rss_change' (relative
+    change of peak RSS). A record whose median or peak RSS grew by more
+    than <threshold> (a fraction, e.g. 0.1 for 10%) gets flagged as slower
+    or bigger. Return the list of flagged records.
+    """
+    old = {(r['day'], r['part']): r for r in baseline['results']
+           if not r.get('error')}
+    flagged = []
+    for r in records:
+        base = old.get((r['day'], r['part']))
+        r['baseline'] = base['median'] if base else None
+        r['change'] = r['rss_change'] = None
+        r['slower'] = r['bigger'] = False
+        if base and not r['error']:
+            r['change'] = r['median'] / base['median'] - 1
+            r['slower'] = r['change'] > threshold
+            # reports made before memory was measured have no peak RSS
+            if base.get('peak_rss') and r['peak_rss']:
+                r['rss_change'] = r['peak_rss'] / base['peak_rss'] - 1
+                r['bigger'] = r['rss_change'] > threshold
+            if r['slower'] or r['bigger']:
+                flagged.append(r)
+    return flagged
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return '-' if seconds is None else "{:.2f}".format(seconds * 1000)
+
+
+def _pct(change: Optional[float]) -> str:
+    return '-' if change is None else "{:+.1%}".format(change)
+
+
+def format_table(records: List[dict]) -> str:
+    with_baseline = any('baseline' in r for r in records)
+    header = ("Day", "Part", "Runs", "Min, ms", "Median, ms", "P95, ms",
+              "Stdev, ms", "Peak RSS, MiB", "Peak blocks")
+    if with_baseline:
+        header += ("Base, ms", "Change", "RSS change", "")
+    rows = [header]
+    for r in records:
+        if r['error']:
+            rows.append((f"{r['day']:02d}", str(r['part']), r['error'])
+                        + ('',) * (len(header) - 3))
+            continue
+        row = (f"{r['day']:02d}", str(r['part']), str(len(r['times'])),
+               _ms(r['min']), _ms(r['median']), _ms(r['p95']),
+               _ms(r['stdev']), runner._mib(r.get('peak_rss')),
+               runner._count(r.get('peak_blocks')))
+        if with_baseline:
+            flags = [flag for flag, key in (('SLOWER', 'slower'),
+                                            ('BIGGER', 'bigger'))
+                     if r.get(key)]
+            row += (_ms(r.get('baseline')), _pct(r.get('change')),
+                    _pct(r.get('rss_change')), " ".join(flags))
+        rows.append(row)
+    return utils.tabulate(rows, 2)
+
+
+def main(args) -> int:
+    days = runner.discover_days(
+        runner.parse_days(args.days) if args.days else None)
+    parts = runner.parse_days(args.parts) if args.parts else runner.PARTS
+
+    records = run(days, parts, args.warmup, args.repeat, args.jobs,
+                  args.verbose)
+    report = make_report(records, args.warmup, args.repeat)
+
+    flagged = []
+    if args.baseline:
+        flagged = compare(records, load_report(args.baseline),
+                          args.threshold / 100)
+
+    print(format_table(records))
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"\nResults saved to {args.output}")
+
+    for key, what in (('slower', 'Slower'), ('bigger', 'Bigger peak RSS')):
+        worse = [r for r in flagged if r[key]]
+        if worse:
+            print("\n{} than baseline by more than {}%: {}".format(
+                what, args.threshold, ", ".join("day {:02d} p.{}".format(
+                    r['day'], r['part']) for r in worse)))
+
+    failed = [r for r in records if r['error']]
+    return 1 if flagged or failed else 0
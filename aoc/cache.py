@@ -0,0 +1,332 @@
+# # #
+# On-disk caches
+#
+# DiskCache is a directory of files, one file per key, with a limit on the
+# total size. When the limit is exceeded, least recently used files are
+# removed (the time of use is kept as the modification time of the file).
+#
+# The decorator parsed() uses such a cache to store results of parsing the
+# input, keyed by the hash of the input and the version of the parser:
+#
+#   @cache.parsed(version=1)
+#   def parse_input(lines: List[str]):
+#       ...
+#
+# The version must be increased whenever the parser or the classes of the
+# objects it creates change. The cached structure is unpickled anew on every
+# call, so the caller can modify it freely.
+#
+# ResultCache keeps answers of solve_p1/solve_p2, keyed by the day, the part,
+# the hash of the input and the hash of the source code the solution depends
+# on: the solution module of the day and, recursively, the solution modules
+# of other days and the modules of the package aoc imported at module level.
+# Any change in these files makes the old answers unreachable; they are
+# eventually evicted.
+#
+# Environment variables:
+#   AOC_CACHE_DIR     -- where the caches are (default: .cache in the repo)
+#   AOC_PARSE_CACHE=0 -- disable caching of parsed inputs
+#
+
+import os
+import re
+import json
+import pickle
+import hashlib
+import functools
+from typing import Optional, Iterable, List, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get('AOC_CACHE_DIR', os.path.join(ROOT, '.cache'))
+
+PARSE_CACHE_SIZE = 64 * 2**20
+RESULT_CACHE_SIZE = 4 * 2**20
+
+
+def content_hash(lines: Iterable[str]) -> str:
+    """Hash of the content of the input given as lines"""
+    if isinstance(lines, str):
+        data = lines
+    else:
+        data = "\n".join(lines)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class DiskCache(object):
+    """Key-value storage of bytes in files of given directory, limited in
+    total size to <max_size> bytes, with LRU eviction. Recently used values
+    are also kept in memory (within the same limit)."""
+
+    def __init__(self, path: str, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        self.memory = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _fname(self, key: str) -> str:
+        return os.path.join(self.path, key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self.memory.get(key)
+        if data is None:
+            try:
+                with open(self._fname(key), 'rb') as fd:
+                    data = fd.read()
+                os.utime(self._fname(key))
+            except OSError:
+                self.misses += 1
+                return None
+            self._remember(key, data)
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self.max_size:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        tmp = "{}.{}.tmp".format(self._fname(key), os.getpid())
+        with open(tmp, 'wb') as fd:
+            fd.write(data)
+        os.replace(tmp, self._fname(key))
+        self._remember(key, data)
+        self.evict()
+
+    def _remember(self, key: str, data: bytes):
+        self.memory.pop(key, None)
+        self.memory[key] = data
+        size = sum(map(len, self.memory.values()))
+        while size > self.max_size:
+            oldest = next(iter(self.memory))
+            size -= len(self.memory.pop(oldest))
+
+    def delete(self, key: str) -> bool:
+        self.memory.pop(key, None)
+        try:
+            os.remove(self._fname(key))
+            return True
+        except OSError:
+            return False
+
+    def entries(self) -> list:
+        """Return a list of (mtime, size, key) of stored files, the least
+        recently used first"""
+        entries = []
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return entries
+        for name in names:
+            if name.endswith('.tmp'):
+                continue
+            try:
+                st = os.stat(self._fname(name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        entries.sort()
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """Remove least recently used files until the total size is within
+        the limit. Return number of removed files."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in entries:
+            if total <= self.max_size:
+                break
+            if self.delete(key):
+                total -= size
+                removed += 1
+        return removed
+
+    def clear(self, prefix: str = '') -> int:
+        """Remove all entries whose keys start with given <prefix>"""
+        removed = 0
+        for _, _, key in self.entries():
+            if key.startswith(prefix):
+                removed += self.delete(key)
+        return removed
+
+
+_parse_cache = None
+
+
+def parse_cache() -> DiskCache:
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = DiskCache(os.path.join(CACHE_DIR, 'parsed'),
+                                 PARSE_CACHE_SIZE)
+    return _parse_cache
+
+
+def parsed(version: int = 1):
+    """Decorator for caching results of a function that parses lines of
+    the input. The function takes the lines as the only argument, or, if it
+    is a classmethod, as the argument that follows the class. The result
+    must be picklable."""
+
+    def decorator(func):
+        name = "{}.{}".format(func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            if os.environ.get('AOC_PARSE_CACHE', '1') == '0':
+                return func(*args)
+
+            owner = ''
+            if len(args) > 1 and isinstance(args[0], type):
+                owner = args[0].__qualname__
+            key = hashlib.sha256("{}:{}:v{}:{}".format(
+                name, owner, version, content_hash(args[-1])
+            ).encode()).hexdigest()
+
+            store = parse_cache()
+            data = store.get(key)
+            if data is not None:
+                try:
+                    return pickle.loads(data)
+                except Exception:
+                    # stale entry, e.g. a class was renamed
+                    store.delete(key)
+
+            res = func(*args)
+            store.put(key, pickle.dumps(res, protocol=pickle.HIGHEST_PROTOCOL))
+            return res
+
+        return wrapper
+
+    return decorator
+
+
+def file_hash(fname: str) -> str:
+    with open(fname, 'rb') as fd:
+        return hashlib.sha256(fd.read()).hexdigest()
+
+
+def _imported_sources(fname: str) -> List[str]:
+    """Return paths to the solution modules of days and the modules of the
+    package aoc that the file imports at module level"""
+    with open(fname) as fd:
+        text = fd.read()
+    sources = [os.path.join(ROOT, other, 'solution.py') for other in
+               re.findall(r'^from (day_\d\d)\.solution import', text, re.M)]
+    modules = set()
+    for module, names in re.findall(r'^from aoc(?:\.(\w+))? import ([\w, ]+)',
+                                    text, re.M):
+        modules.update([module] if module else names.split(', '))
+    for module in sorted(modules):
+        path = os.path.join(ROOT, 'aoc', module + '.py')
+        if os.path.isfile(path):
+            sources.append(path)
+    return sources
+
+
+def day_sources(day: int) -> List[str]:
+    """Return paths to the files that the solution of given day depends on:
+    its solution module, aoc/utils.py and all modules these import (see
+    _imported_sources()), and the modules those import, and so on"""
+    fname = os.path.join(ROOT, f"day_{day:02d}", 'solution.py')
+    sources = [fname, os.path.join(ROOT, 'aoc', 'utils.py')]
+    pending = list(sources)
+    while pending:
+        for path in _imported_sources(pending.pop()):
+            if path not in sources:
+                sources.append(path)
+                pending.append(path)
+    return sources
+
+
+class ResultCache(object):
+    """Persistent cache of answers to the parts of the days.
+    Statistics of hits and misses are accumulated across runs in a file
+    next to the cache directory."""
+
+    def __init__(self, path: Optional[str] = None,
+                 max_size: int = RESULT_CACHE_SIZE):
+        path = path or os.path.join(CACHE_DIR, 'results')
+        self.store = DiskCache(path, max_size)
+        self.stats_file = path + '.stats.json'
+
+    @staticmethod
+    def make_key(day: int, part: int, input_file: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(file_hash(input_file).encode())
+        for fname in day_sources(day):
+            digest.update(file_hash(fname).encode())
+        return "day{:02d}.p{}.{}".format(day, part, digest.hexdigest())
+
+    def get(self, key: str) -> Optional[dict]:
+        data = self.store.get(key)
+        return None if data is None else json.loads(data)
+
+    def put(self, key: str, record: dict):
+        self.store.put(key, json.dumps(record).encode())
+
+    def invalidate(self, days: Optional[Iterable[int]] = None) -> int:
+        """Remove cached answers of given days (default: all days)"""
+        if days is None:
+            return self.store.clear()
+        return sum(self.store.clear("day{:02d}.".format(day)) for day in days)
+
+    def stats(self) -> Dict[str, int]:
+        """Return accumulated statistics"""
+        try:
+            with open(self.stats_file) as fd:
+                stats = json.load(fd)
+        except (OSError, ValueError):
+            stats = {'hits': 0, 'misses': 0}
+        stats['entries'] = len(self.store.entries())
+        stats['size'] = self.store.size()
+        return stats
+
+    def save_stats(self):
+        """Add hits and misses counted so far to the accumulated statistics"""
+        stats = self.stats()
+        stats['hits'] += self.store.hits
+        stats['misses'] += self.store.misses
+        self.store.hits = self.store.misses = 0
+        os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
+        with open(self.stats_file, 'w') as fd:
+            json.dump({'hits': stats['hits'], 'misses': stats['misses']}, fd)
+
+    def reset_stats(self):
+        try:
+            os.remove(self.stats_file)
+        except OSError:
+            pass
+
+
+def main(args) -> int:
+    """Show statistics of the caches or clear them"""
+    from aoc import runner
+
+    days = runner.parse_days(args.days) if args.days else None
+    caches = []
+    if args.kind in {'results', 'all'}:
+        caches.append(('results', ResultCache()))
+    if args.kind in {'parsed', 'all'}:
+        caches.append(('parsed', parse_cache()))
+
+    for name, cache in caches:
+        if args.action == 'clear':
+            if isinstance(cache, ResultCache):
+                removed = cache.invalidate(days)
+                if days is None:
+                    cache.reset_stats()
+            else:
+                removed = cache.clear()
+            print(f"{name}: removed {removed} entries")
+        elif isinstance(cache, ResultCache):
+            stats = cache.stats()
+            print("{}: {} entries, {} bytes, {} hits, {} misses".format(
+                name, stats['entries'], stats['size'],
+                stats['hits'], stats['misses']))
+        else:
+            print("{}: {} entries, {} bytes".format(
+                name, len(cache.entries()), cache.size()))
+    return 0
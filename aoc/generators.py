@@ -0,0 +1,318 @@
+# # #
+# Generators of synthetic puzzle inputs of arbitrary size
+#
+# For every day, there is a function that takes the size of the input and
+# a random generator and returns the lines of a valid input. The meaning of
+# the size depends on the day (number of lines, side of the grid, etc), see
+# the column "size" in GENERATORS.
+#
+#   python -m aoc generate 15 500 -o big.txt
+#
+# Day 21 is not here: its input is just two starting positions.
+#
+
+import random
+import string
+from typing import List, Dict, Tuple, Callable
+
+
+def day_01(size: int, rng: random.Random) -> List[str]:
+    depth = rng.randint(100, 200)
+    lines = []
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-20, 30))
+        lines.append(str(depth))
+    return lines
+
+
+def day_02(size: int, rng: random.Random) -> List[str]:
+    commands = ('forward', 'down', 'up')
+    return ["{} {}".format(rng.choices(commands, (4, 3, 2))[0],
+                           rng.randint(1, 9))
+            for _ in range(size)]
+
+
+def day_03(size: int, rng: random.Random, width: int = 12) -> List[str]:
+    # An odd number of numbers has no tied columns. Part 2 needs both bits
+    # at the next position while more than one number is left: the numbers
+    # are the leaves of a binary trie where every inner node has 2 children.
+    size = max(3, size | 1)
+    width = max(width, size.bit_length() + 1)
+    numbers = []
+
+    def fill(prefix: str, count: int):
+        rest = width - len(prefix)
+        if count == 1:
+            numbers.append(prefix + "".join(rng.choice('01')
+                                            for _ in range(rest)))
+            return
+        room = 2 ** (rest - 1)
+        zeros = rng.randint(max(1, count - room), min(count - 1, room))
+        fill(prefix + '0', zeros)
+        fill(prefix + '1', count - zeros)
+
+    fill('', size)
+    rng.shuffle(numbers)
+    return numbers
+
+
+def day_04(size: int, rng: random.Random) -> List[str]:
+    draws = list(range(100))
+    rng.shuffle(draws)
+    lines = [",".join(map(str, draws))]
+    for _ in range(size):
+        lines.append('')
+        numbers = rng.sample(range(100), 25)
+        for i in range(0, 25, 5):
+            lines.append(" ".join(f"{n:2d}" for n in numbers[i:i+5]))
+    return lines
+
+
+def day_05(size: int, rng: random.Random, extent: int = 1000) -> List[str]:
+    lines = []
+    for _ in range(size):
+        x1, y1 = rng.randrange(extent), rng.randrange(extent)
+        kind = rng.randrange(3)
+        if kind == 0:    # horizontal
+            x2, y2 = rng.randrange(extent), y1
+        elif kind == 1:  # vertical
+            x2, y2 = x1, rng.randrange(extent)
+        else:            # diagonal at 45 degrees
+            d = rng.randint(-min(x1, y1), extent - 1 - max(x1, y1))
+            x2, y2 = x1 + d, y1 + d
+        lines.append(f"{x1},{y1} -> {x2},{y2}")
+    return lines
+
+
+def day_06(size: int, rng: random.Random) -> List[str]:
+    return [",".join(str(rng.randint(1, 5)) for _ in range(size))]
+
+
+def day_07(size: int, rng: random.Random) -> List[str]:
+    return [",".join(str(rng.randrange(2 * size)) for _ in range(size))]
+
+
+def _digit_grid(size: int, rng: random.Random, digits: str,
+                weights=None) -> List[str]:
+    return ["".join(rng.choices(digits, weights, k=size)) for _ in range(size)]
+
+
+def _flood(heights: List[List[int]], start: Tuple[int, int], old: int,
+           new: Callable[[int], int]) -> List[Tuple[int, int]]:
+    """Replace value <old> by new(value of the previous cell) in the area
+    around <start>, breadth first. Return the cells of the area."""
+    size = len(heights)
+    area = [start]
+    for x0, y0 in area:
+        for x1, y1 in ((x0 - 1, y0), (x0 + 1, y0), (x0, y0 - 1), (x0, y0 + 1)):
+            if 0 <= x1 < size and 0 <= y1 < size and heights[y1][x1] == old:
+                heights[y1][x1] = new(heights[y0][x0])
+                area.append((x1, y1))
+    return area
+
+
+def day_09(size: int, rng: random.Random) -> List[str]:
+    # Frequent 9s make walls between basins. Every basin has one low point:
+    # heights grow with the distance from a random cell of the basin.
+    # -1 marks cells not seen yet, -2 the cells of the current basin.
+    heights = [[9 if rng.random() < 0.5 else -1 for _ in range(size)]
+               for _ in range(size)]
+    for y in range(size):
+        for x in range(size):
+            if heights[y][x] != -1:
+                continue
+            heights[y][x] = -2
+            basin = _flood(heights, (x, y), -1, lambda _: -2)
+            low = rng.choice(basin)
+            heights[low[1]][low[0]] = rng.randint(0, 4)
+            _flood(heights, low, -2, lambda h: min(8, h + 1))
+    return ["".join(map(str, row)) for row in heights]
+
+
+def day_10(size: int, rng: random.Random, length: int = 100) -> List[str]:
+    pairs = {'(': ')', '[': ']', '{': '}', '<': '>'}
+    lines = []
+    for _ in range(size):
+        stack, chars = [], []
+        # half of the lines get corrupted at a random position
+        corrupt_at = rng.randrange(length) if rng.random() < 0.5 else None
+        while len(chars) < length:
+            if (stack and corrupt_at is not None
+                    and len(chars) >= corrupt_at):
+                wrong = [ch for ch in pairs.values() if ch != stack[-1]]
+                chars.append(rng.choice(wrong))
+                corrupt_at = None
+            elif stack and rng.random() < 0.45:
+                chars.append(stack.pop())
+            else:
+                ch = rng.choice(list(pairs))
+                chars.append(ch)
+                stack.append(pairs[ch])
+        lines.append("".join(chars))
+    return lines
+
+
+def day_11(size: int, rng: random.Random) -> List[str]:
+    return _digit_grid(size, rng, '0123456789')
+
+
+def day_12(size: int, rng: random.Random) -> List[str]:
+    names = [a + b for a in string.ascii_lowercase
+             for b in string.ascii_lowercase]
+    small = rng.sample(names, size)
+    big = [name.upper() for name in
+           rng.sample([n for n in names if n not in small],
+                      max(1, size // 3))]
+    edges = set()
+    # big caves are never connected to each other, otherwise the number of
+    # paths is infinite
+    for cave in small:
+        for other in rng.sample(big, min(len(big), rng.randint(1, 2))):
+            edges.add((cave, other))
+        if rng.random() < 0.3:
+            other = rng.choice(small)
+            if other != cave:
+                edges.add((cave, other))
+    for node in ('start', 'end'):
+        for other in rng.sample(small + big, 2):
+            edges.add((node, other))
+    return [f"{a}-{b}" for a, b in sorted(edges)]
+
+
+def _folds(axis: str, extent: int) -> List[str]:
+    """Fold in halves until the paper is small"""
+    folds = []
+    while not folds or extent > 40:
+        extent //= 2
+        folds.append(f"fold along {axis}={extent}")
+    return folds
+
+
+def day_13(size: int, rng: random.Random) -> List[str]:
+    width, height = 2 * size + 1, size + 1
+    dots = set()
+    while len(dots) < 4 * size:
+        x, y = rng.randrange(width), rng.randrange(height)
+        # dots never appear on the lines of the first folds
+        if x != width // 2 and y != height // 2:
+            dots.add((x, y))
+    folds = _folds('x', width) + _folds('y', height)
+    return [f"{x},{y}" for x, y in sorted(dots)] + [''] + folds
+
+
+def day_14(size: int, rng: random.Random) -> List[str]:
+    letters = 'BCFHKNOPSV'
+    lines = ["".join(rng.choice(letters) for _ in range(size)), '']
+    for a in letters:
+        for b in letters:
+            lines.append(f"{a}{b} -> {rng.choice(letters)}")
+    return lines
+
+
+def day_15(size: int, rng: random.Random) -> List[str]:
+    return _digit_grid(size, rng, '123456789')
+
+
+def _packet(depth: int, rng: random.Random) -> str:
+    """Bits of a random packet with nesting of given depth"""
+    version = f"{rng.randrange(8):03b}"
+    if depth == 0:
+        value = f"{rng.randrange(1, 2**16):b}"
+        value = value.zfill(-(-len(value) // 4) * 4)
+        groups = [value[i:i+4] for i in range(0, len(value), 4)]
+        return version + '100' + "".join(
+            ('1' if i < len(groups) - 1 else '0') + g
+            for i, g in enumerate(groups))
+    typeid = rng.choice([0, 1, 2, 3, 5, 6, 7])
+    if typeid in {5, 6, 7}:
+        count = 2
+    elif typeid == 1:
+        count = rng.randint(1, 2)  # keep the products small
+    else:
+        count = rng.randint(1, 3)
+    # one subpacket goes deeper, others are literals
+    subpackets = [_packet(0, rng) for _ in range(count)]
+    subpackets[rng.randrange(count)] = _packet(depth - 1, rng)
+    body = "".join(subpackets)
+    if len(body) < 2**15 and rng.random() < 0.5:
+        header = '0' + f"{len(body):015b}"
+    else:
+        header = '1' + f"{count:011b}"
+    return version + f"{typeid:03b}" + header + body
+
+
+def day_16(size: int, rng: random.Random) -> List[str]:
+    bits = _packet(size, rng)
+    bits += '0' * (-len(bits) % 8)
+    return ["".join(f"{int(bits[i:i+4], 2):X}"
+                    for i in range(0, len(bits), 4))]
+
+
+def day_17(size: int, rng: random.Random) -> List[str]:
+    x1 = size + rng.randrange(size // 4 + 1)
+    y1 = -size - rng.randrange(size // 4 + 1)
+    x2, y2 = x1 + size // 3, y1 + size // 4
+    return [f"target area: x={x1}..{x2}, y={y1}..{y2}"]
+
+
+def _snailfish(depth: int, rng: random.Random) -> str:
+    if depth == 0 or (depth < 4 and rng.random() < 0.3):
+        return str(rng.randrange(10))
+    return "[{},{}]".format(_snailfish(depth - 1, rng),
+                            _snailfish(depth - 1, rng))
+
+
+def day_18(size: int, rng: random.Random) -> List[str]:
+    return ["[{},{}]".format(_snailfish(3, rng), _snailfish(3, rng))
+            for _ in range(size)]
+
+
+def day_20(size: int, rng: random.Random) -> List[str]:
+    algo = [rng.choice('.#') for _ in range(512)]
+    # like in the real input, the infinite image blinks
+    algo[0], algo[511] = '#', '.'
+    return ["".join(algo), ''] + _digit_grid(size, rng, '.#')
+
+
+# day --> (generator, meaning of size, default sizes, parts worth scaling)
+GENERATORS: Dict[int, Tuple[Callable, str, List[int], Tuple[int, ...]]] = {
+    1: (day_01, 'readings', [10**4, 10**5, 10**6], (1, 2)),
+    2: (day_02, 'commands', [10**4, 10**5, 10**6], (1, 2)),
+    3: (day_03, 'numbers', [10**3, 10**4, 10**5], (1, 2)),
+    4: (day_04, 'boards', [100, 400, 1600], (1, 2)),
+    5: (day_05, 'segments', [250, 500, 1000], (1, 2)),
+    6: (day_06, 'fish', [50, 100, 200], (1, 2)),
+    7: (day_07, 'crabs', [250, 500, 1000], (1, 2)),
+    9: (day_09, 'grid side', [25, 50, 100], (1, 2)),
+    10: (day_10, 'lines', [10**3, 10**4, 10**5], (1, 2)),
+    # part 2 stops when all octopuses flash at once, which a random grid
+    # does not guarantee
+    11: (day_11, 'grid side', [10, 20, 40], (1,)),
+    12: (day_12, 'small caves', [3, 4, 5, 6], (1, 2)),
+    13: (day_13, 'half width', [100, 1000, 10000], (1, 2)),
+    14: (day_14, 'template length', [10**3, 10**4, 10**5], (1, 2)),
+    15: (day_15, 'grid side', [25, 50, 100], (1, 2)),
+    16: (day_16, 'packet depth', [10, 40, 160], (1, 2)),
+    17: (day_17, 'target distance', [25, 50, 100], (1, 2)),
+    18: (day_18, 'numbers', [10, 20, 40], (1, 2)),
+    20: (day_20, 'image side', [25, 50, 100], (1, 2)),
+}
+
+
+def generate(day: int, size: int, seed: int = 2021) -> List[str]:
+    """Generate lines of an input of given size for given day"""
+    if day not in GENERATORS:
+        raise ValueError(f"No generator of inputs for day {day}")
+    func = GENERATORS[day][0]
+    return func(size, random.Random(f"{day}:{size}:{seed}"))
+
+
+def main(args) -> int:
+    lines = generate(args.day, args.size, args.seed)
+    text = "\n".join(lines) + "\n"
+    if args.output:
+        with open(args.output, 'w') as fd:
+            fd.write(text)
+    else:
+        print(text, end='')
+    return 0
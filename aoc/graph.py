@@ -0,0 +1,320 @@
+# # #
+# Search and shortest paths on graphs with integer nodes
+#
+# A graph with N nodes is given by adjacency lists: neighbors[u] is the list
+# of nodes v such that there is an edge u -> v. Weighted graphs also have
+# weights[u][i], the weight of the edge from u to neighbors[u][i]. Graphs
+# with string nodes can be converted with from_edges(), a Grid provides
+# adjacency lists of its cells with neighbor_lists().
+#
+# Searches with priority queues count pushes, pops and outdated (stale) pops
+# in metrics '<algorithm> pushes' etc.
+#
+# Complexity, for V nodes and E edges:
+#   bfs, dfs, components -- O(V + E)
+#   dijkstra, astar      -- O((V + E) log V), binary heap with lazy deletion
+#   dial                 -- O(V + E + D) for weights in 0..W, D being the
+#                           distance to the farthest visited node
+#
+
+import heapq
+from collections import deque
+from typing import List, Tuple, Dict, Iterable, Optional, Callable
+
+from aoc import metrics
+
+INF = float('inf')
+
+Neighbors = List[List[int]]
+Weights = List[List[int]]
+
+
+def from_edges(edges: Iterable[Tuple[str, str]], directed: bool = False
+               ) -> Tuple[List[str], Dict[str, int], Neighbors]:
+    """Make adjacency lists from pairs of names of nodes. Return the names
+    (in the order of first appearance), the mapping name --> node and the
+    adjacency lists."""
+    names, index, neighbors = [], {}, []
+    for src, trg in edges:
+        for name in (src, trg):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+                neighbors.append([])
+        neighbors[index[src]].append(index[trg])
+        if not directed:
+            neighbors[index[trg]].append(index[src])
+    return names, index, neighbors
+
+
+def node_weights(neighbors: Neighbors, costs: List[int]) -> Weights:
+    """Make weights of edges from costs of entering the nodes: the edge
+    u -> v weighs costs[v]"""
+    return [[costs[v] for v in row] for row in neighbors]
+
+
+def bfs(neighbors: Neighbors, source: int,
+        allowed: Optional[List[bool]] = None) -> List[int]:
+    """Return the number of edges on a shortest path from <source> to every
+    node, -1 for unreachable nodes. If <allowed> is given, only nodes for
+    which it is true are entered."""
+    dist = [-1] * len(neighbors)
+    dist[source] = 0
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        du = dist[u] + 1
+        for v in neighbors[u]:
+            if dist[v] < 0 and (allowed is None or allowed[v]):
+                dist[v] = du
+                queue.append(v)
+    return dist
+
+
+def dfs(neighbors: Neighbors, source: int,
+        allowed: Optional[List[bool]] = None) -> List[int]:
+    """Return nodes reachable from <source> in depth-first preorder.
+    See bfs() for <allowed>."""
+    seen = [False] * len(neighbors)
+    order = []
+    stack = [source]
+    while stack:
+        u = stack.pop()
+        if seen[u]:
+            continue
+        seen[u] = True
+        order.append(u)
+        # reversed, so that neighbors are visited in their order
+        for v in reversed(neighbors[u]):
+            if not seen[v] and (allowed is None or allowed[v]):
+                stack.append(v)
+    return order
+
+
+def components(neighbors: Neighbors,
+               allowed: Optional[List[bool]] = None) -> List[List[int]]:
+    """Split (allowed) nodes of an undirected graph into connected
+    components"""
+    seen = [False] * len(neighbors)
+    comps = []
+    for start in range(len(neighbors)):
+        if seen[start] or (allowed is not None and not allowed[start]):
+            continue
+        seen[start] = True
+        comp = [start]
+        for u in comp:
+            for v in neighbors[u]:
+                if not seen[v] and (allowed is None or allowed[v]):
+                    seen[v] = True
+                    comp.append(v)
+        comps.append(comp)
+    return comps
+
+
+def dijkstra(neighbors: Neighbors, weights: Weights, source: int,
+             target: Optional[int] = None) -> List[float]:
+    """Return lengths of shortest paths from <source> to every node (INF for
+    unreachable nodes). Weights must be non-negative. If <target> is given,
+    the search stops as soon as the distance to it is known and distances
+    to some other nodes may be too large."""
+    dist = [INF] * len(neighbors)
+    dist[source] = 0
+    heap = [(0, source)]
+    pops = stale = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        pops += 1
+        if d > dist[u]:
+            # outdated entry, the node was reached by a shorter path later
+            stale += 1
+            continue
+        if u == target:
+            break
+        for v, w in zip(neighbors[u], weights[u]):
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    _count('dijkstra', pops + len(heap), pops, stale)
+    return dist
+
+
+def astar(neighbors: Neighbors, weights: Weights, source: int, target: int,
+          heuristic: Callable[[int], float]) -> float:
+    """Return the length of a shortest path from <source> to <target>, INF if
+    there is none. <heuristic>(u) estimates the distance from u to <target>
+    and must never overestimate it (and be consistent: h(u) <= w(u,v) + h(v)).
+    With heuristic 0 this is Dijkstra's algorithm."""
+    dist = {source: 0}
+    heap = [(heuristic(source), 0, source)]
+    pops = stale = 0
+    res = INF
+    while heap:
+        _, d, u = heapq.heappop(heap)
+        pops += 1
+        if u == target:
+            res = d
+            break
+        if d > dist[u]:
+            stale += 1
+            continue
+        for v, w in zip(neighbors[u], weights[u]):
+            nd = d + w
+            if nd < dist.get(v, INF):
+                dist[v] = nd
+                heapq.heappush(heap, (nd + heuristic(v), nd, v))
+    _count('astar', pops + len(heap), pops, stale)
+    return res
+
+
+def dial(neighbors: Neighbors, weights: Weights, source: int,
+         target: Optional[int] = None,
+         max_weight: Optional[int] = None) -> List[float]:
+    """Same as dijkstra() for small integer weights 0..<max_weight>, with
+    a circular array of buckets instead of a heap (Dial's algorithm)"""
+    if max_weight is None:
+        max_weight = max((max(row) for row in weights if row), default=0)
+    nbuckets = max_weight + 1
+    buckets = [[] for _ in range(nbuckets)]
+    dist = [INF] * len(neighbors)
+    dist[source] = 0
+    buckets[0].append(source)
+    pushes, pops, stale = 1, 0, 0
+    d = 0
+    while pushes > pops:
+        bucket = buckets[d % nbuckets]
+        while bucket:
+            u = bucket.pop()
+            pops += 1
+            if dist[u] != d:
+                # outdated entry
+                stale += 1
+                continue
+            if u == target:
+                _count('dial', pushes, pops, stale)
+                return dist
+            for v, w in zip(neighbors[u], weights[u]):
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    buckets[nd % nbuckets].append(v)
+                    pushes += 1
+        d += 1
+    _count('dial', pushes, pops, stale)
+    return dist
+
+
+def _count(algorithm: str, pushes: int, pops: int, stale: int):
+    metrics.counter(algorithm + ' pushes').inc(pushes)
+    metrics.counter(algorithm + ' pops').inc(pops)
+    metrics.counter(algorithm + ' stale pops').inc(stale)
+
+
+# # #
+# Tests: python -m aoc.graph
+#
+
+edges_1 = [('start', 'A'), ('start', 'b'), ('A', 'c'), ('A', 'b'),
+           ('b', 'd'), ('A', 'end'), ('b', 'end'), ('x', 'y')]
+
+# directed and weighted: 0 -> 1 weighs 7, 0 -> 2 weighs 9, ...
+neighbors_2 = [[1, 2, 5], [2, 3], [3, 5], [4], [], [4], [0]]
+weights_2 = [[7, 9, 14], [10, 15], [11, 2], [6], [], [9], [1]]
+dist_2 = [0, 7, 9, 20, 20, 11, INF]
+
+
+def random_graph(nodes: int, edges: int, max_weight: int,
+                 seed: int) -> Tuple[Neighbors, Weights]:
+    """Directed graph with random edges and weights 0..<max_weight>"""
+    import random
+    rng = random.Random(seed)
+    neighbors = [[] for _ in range(nodes)]
+    for _ in range(edges):
+        neighbors[rng.randrange(nodes)].append(rng.randrange(nodes))
+    weights = [[rng.randint(0, max_weight) for _ in row] for row in neighbors]
+    return neighbors, weights
+
+
+def grid_graph(width: int) -> Tuple[Neighbors, Weights]:
+    """Square grid, 4 neighbors, entering a cell costs 1..9"""
+    costs = [1 + (7 * i * i + 3 * i) % 9 for i in range(width * width)]
+    neighbors = [[v for v in (u - width, u + width) if 0 <= v < len(costs)] +
+                 [v for v in (u - 1, u + 1) if v // width == u // width]
+                 for u in range(len(costs))]
+    return neighbors, node_weights(neighbors, costs)
+
+
+def run_tests():
+    print("--- Tests ---")
+
+    names, index, neighbors = from_edges(edges_1)
+    exp = ['start', 'A', 'b', 'c', 'd', 'end', 'x', 'y']
+    print("T1.0.names:", names == exp, exp, names)
+    exp = ['start', 'A', 'd', 'end']
+    res = [names[v] for v in neighbors[index['b']]]
+    print("T1.0.neighbors:", res == exp, exp, res)
+    _, index, directed = from_edges(edges_1, directed=True)
+    exp = ['d', 'end']
+    res = [names[v] for v in directed[index['b']]]
+    print("T1.0.directed:", res == exp, exp, res)
+
+    exp = [0, 1, 1, 2, 2, 2, -1, -1]
+    res = bfs(neighbors, 0)
+    print("T2.0.bfs:", res == exp, exp, res)
+    exp = [0, -1, 1, -1, 2, 2, -1, -1]
+    res = bfs(neighbors, 0, [name != 'A' for name in names])
+    print("T2.0.bfs.allowed:", res == exp, exp, res)
+    exp = ['start', 'A', 'c', 'b', 'd', 'end']
+    res = [names[u] for u in dfs(neighbors, 0)]
+    print("T2.0.dfs:", res == exp, exp, res)
+    exp = [['start', 'A', 'b', 'c', 'end', 'd'], ['x', 'y']]
+    res = [[names[u] for u in comp] for comp in components(neighbors)]
+    print("T2.0.components:", res == exp, exp, res)
+
+    res = dijkstra(neighbors_2, weights_2, 0)
+    print("T3.0.dijkstra:", res == dist_2, dist_2, res)
+    res = dial(neighbors_2, weights_2, 0)
+    print("T3.0.dial:", res == dist_2, dist_2, res)
+    res = [astar(neighbors_2, weights_2, 0, target, lambda u: 0)
+           for target in range(len(dist_2))]
+    print("T3.0.astar:", res == dist_2, dist_2, res)
+
+    # random graphs: the shortest paths agree, with unit weights they are
+    # the distances bfs finds, dfs and components find the reachable nodes
+    for tid in range(1, 6):
+        neighbors, weights = random_graph(60, 200, 9, tid)
+        target = len(neighbors) - 1
+        exp = dijkstra(neighbors, weights, 0)
+        res = dial(neighbors, weights, 0)
+        print(f"T3.{tid}.dial:", res == exp)
+        res = [dijkstra(neighbors, weights, 0, target)[target],
+               dial(neighbors, weights, 0, target, 9)[target],
+               astar(neighbors, weights, 0, target, lambda u: 0)]
+        print(f"T3.{tid}.target:", res == [exp[target]] * 3, exp[target], res)
+
+        units = [[1] * len(row) for row in neighbors]
+        exp = [-1 if d == INF else d for d in dijkstra(neighbors, units, 0)]
+        res = bfs(neighbors, 0)
+        print(f"T3.{tid}.bfs:", res == exp)
+        reachable = [u for u, d in enumerate(exp) if d >= 0]
+        res = sorted(dfs(neighbors, 0))
+        print(f"T3.{tid}.dfs:", res == reachable)
+        undirected = from_edges((u, v) for u, row in enumerate(neighbors)
+                                for v in row)
+        res = components(undirected[2])
+        print(f"T3.{tid}.components:", sum(map(len, res)) == len(
+            undirected[0]) and all(sorted(dfs(undirected[2], comp[0])) ==
+                                   sorted(comp) for comp in res))
+
+    # A* with the Manhattan distance, consistent for weights of at least 1
+    width = 12
+    neighbors, weights = grid_graph(width)
+    target = len(neighbors) - 1
+    exp = dijkstra(neighbors, weights, 0)[target]
+    res = astar(neighbors, weights, 0, target,
+                lambda u: (width - 1 - u % width) + (width - 1 - u // width))
+    print("T4.0.astar:", res == exp, exp, res)
+
+
+if __name__ == '__main__':
+    run_tests()
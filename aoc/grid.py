@@ -0,0 +1,139 @@
+# # #
+# Rectangular grid of small integers, stored in a 2D numpy array
+#
+# A cell is addressed either by its coordinates (x, y), x being the row, or by
+# its flat index x * width + y. Code that walks the grid cell by cell in pure
+# Python is fastest with flat indices and plain lists:
+#
+#   grid = Grid.from_lines(lines)
+#   values = grid.flat.tolist()
+#   neighbors = grid.neighbor_lists(4)
+#   for idx in neighbors[start]:
+#       ... values[idx] ...
+#
+# Code that updates the whole grid at once should work on grid.cells with
+# numpy operations, around() helps combining values of the neighbors:
+#
+#   lowest = grid.cells < grid.around(np.minimum, fill=10)
+#
+
+import functools
+from typing import List, Tuple
+
+import numpy as np
+
+from aoc import utils
+
+# Coordinate offsets to access cells around another cell
+SIDES = [(-1, 0), (0, -1), (0, 1), (1, 0)]
+CORNERS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+OFFSETS = {
+    4: SIDES,
+    8: sorted(SIDES + CORNERS),
+}
+
+
+@functools.lru_cache(maxsize=16)
+def neighbor_table(shape: Tuple[int, int], connectivity: int = 4
+                   ) -> np.ndarray:
+    """Return an array of shape (height * width, connectivity) with flat
+    indices of the neighbors of every cell of a grid of given shape.
+    Missing neighbors (beyond the edges) are -1. Do not modify the result,
+    it is shared."""
+    height, width = shape
+    xs, ys = np.divmod(np.arange(height * width), width)
+    table = np.empty((height * width, connectivity), dtype=np.int64)
+    for col, (dx, dy) in enumerate(OFFSETS[connectivity]):
+        nx, ny = xs + dx, ys + dy
+        inside = (nx >= 0) & (nx < height) & (ny >= 0) & (ny < width)
+        table[:, col] = np.where(inside, nx * width + ny, -1)
+    table.flags.writeable = False
+    return table
+
+
+@functools.lru_cache(maxsize=16)
+def neighbor_lists(shape: Tuple[int, int], connectivity: int = 4
+                   ) -> List[List[int]]:
+    """Same as neighbor_table() but as lists of existing neighbors only.
+    Do not modify the result, it is shared."""
+    return [[idx for idx in row if idx >= 0]
+            for row in neighbor_table(shape, connectivity).tolist()]
+
+
+class Grid(object):
+
+    def __init__(self, cells: np.ndarray):
+        self.cells = cells
+
+    @classmethod
+    def from_lines(cls, lines: List[str]):
+        """Make a grid of digits. Not cached with cache.parsed(): parsing is
+        vectorized and takes less than a hit of the cache would."""
+        return cls(utils.digit_grid(lines))
+
+    def dims(self) -> Tuple[int, int]:
+        return self.cells.shape
+
+    def __len__(self):
+        """Total number of cells on the grid"""
+        return self.cells.size
+
+    def __getitem__(self, pos):
+        return self.cells[pos]
+
+    def __setitem__(self, pos, val):
+        self.cells[pos] = val
+
+    def __str__(self):
+        return "\n".join("".join(map(str, row)) for row in self.cells.tolist())
+
+    @property
+    def flat(self) -> np.ndarray:
+        """Cells as 1D array, indexed by flat indices. This is a view
+        (changes are visible in the grid) unless the grid is a view of
+        columns of another grid."""
+        return self.cells.reshape(-1)
+
+    def index(self, x: int, y: int) -> int:
+        return x * self.cells.shape[1] + y
+
+    def coords(self, idx: int) -> Tuple[int, int]:
+        return divmod(idx, self.cells.shape[1])
+
+    def view(self, rows=slice(None), cols=slice(None)):
+        """Make a grid of given rows and columns (slices) that shares the
+        cells with this grid"""
+        return self.__class__(self.cells[rows, cols])
+
+    def copy(self):
+        return self.__class__(self.cells.copy())
+
+    def neighbor_table(self, connectivity: int = 4) -> np.ndarray:
+        return neighbor_table(self.cells.shape, connectivity)
+
+    def neighbor_lists(self, connectivity: int = 4) -> List[List[int]]:
+        return neighbor_lists(self.cells.shape, connectivity)
+
+    def shifted(self, dx: int, dy: int, values=None, fill=0) -> np.ndarray:
+        """Return an array in which the cell (x, y) holds the value of the
+        cell (x+dx, y+dy) of <values> (default: the cells of the grid), or
+        <fill> if there is no such cell."""
+        values = self.cells if values is None else values
+        height, width = values.shape
+        res = np.full_like(values, fill)
+        res[max(0, -dx):height-max(0, dx), max(0, -dy):width-max(0, dy)] = \
+            values[max(0, dx):height+min(0, dx), max(0, dy):width+min(0, dy)]
+        return res
+
+    def around(self, ufunc, values=None, connectivity: int = 4, fill=0
+               ) -> np.ndarray:
+        """Combine values of the neighbors of every cell with a binary numpy
+        function, e.g. around(np.add) gives the sums of the neighbors and
+        around(np.minimum, fill=10) the smallest neighbor. Missing
+        neighbors take the value <fill>."""
+        res = None
+        for dx, dy in OFFSETS[connectivity]:
+            shifted = self.shifted(dx, dy, values, fill)
+            res = shifted if res is None else ufunc(res, shifted, out=res)
+        return res
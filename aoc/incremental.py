@@ -0,0 +1,102 @@
+# # #
+# Incremental (online) solving of line-oriented puzzles
+#
+# An incremental solver receives the lines of the input one by one and can be
+# asked for the answer for the lines seen so far at any time. A day module
+# that supports it provides the dictionary
+#
+#   INCREMENTAL = {1: SolverOfPart1, 2: SolverOfPart2}
+#
+# of classes derived from Solver. Feeding a line takes O(1) amortized time
+# (or O(log n) where noted), independent of the number of lines seen before.
+# The answers to both parts at once come from INCREMENTAL['all'], if the day
+# has a solver that does both in one pass, or from the solvers of the parts
+# fed the same lines (see Parts).
+#
+#   python -m aoc follow 1 2 log.txt
+#   tail -f log.txt | python -m aoc follow 1 all --every 1000
+#
+
+import sys
+from typing import Iterable, Iterator, Dict
+
+
+class Solver(object):
+    """Base class of incremental solvers"""
+
+    def feed(self, line: str):
+        """Account for one more line of the input"""
+        raise NotImplementedError
+
+    def feed_lines(self, lines: Iterable[str]):
+        for line in lines:
+            self.feed(line)
+        return self
+
+    def answer(self):
+        """Answer for the lines fed so far"""
+        raise NotImplementedError
+
+
+class Parts(Solver):
+    """Solvers of several parts fed the same lines. The answer is the tuple
+    of their answers."""
+
+    def __init__(self, solvers: Dict[int, type]):
+        self.solvers = [solvers[part]() for part in sorted(solvers)]
+
+    def feed(self, line: str):
+        for solver in self.solvers:
+            solver.feed(line)
+
+    def answer(self) -> tuple:
+        return tuple(solver.answer() for solver in self.solvers)
+
+
+def make_solver(module, part) -> Solver:
+    """Make the incremental solver of given part (a number or 'all') of the
+    day, or return None if there is none"""
+    solvers = getattr(module, 'INCREMENTAL', {})
+    if part in solvers:
+        return solvers[part]()
+    if part == 'all':
+        parts = {p: cls for p, cls in solvers.items() if p != 'all'}
+        if parts:
+            return Parts(parts)
+    return None
+
+
+def follow(solver: Solver, lines: Iterable[str], every: int = 1) -> Iterator:
+    """Feed the lines to the solver, generating the answer after every
+    <every> lines and after the last line"""
+    count = 0
+    for count, line in enumerate(lines, 1):
+        solver.feed(line)
+        if count % every == 0:
+            yield solver.answer()
+    if count % every:
+        yield solver.answer()
+
+
+def main(args) -> int:
+    """Print the answer after every line (or every <args.every> lines) read
+    from a file or stdin"""
+    from aoc import runner
+
+    module = runner.import_day(args.day)
+    part = args.part if args.part == 'all' else int(args.part)
+    solver = make_solver(module, part)
+    if solver is None:
+        what = "Day {:02d}{}".format(
+            args.day, '' if part == 'all' else f" p.{part}")
+        print(f"{what} can not be solved incrementally", file=sys.stderr)
+        return 1
+
+    stream = open(args.input) if args.input else sys.stdin
+    with stream:
+        lines = (line.rstrip('\r\n') for line in stream)
+        for answer in follow(solver, lines, args.every):
+            if isinstance(answer, tuple):
+                answer = " ".join(map(str, answer))
+            print(answer, flush=True)
+    return 0
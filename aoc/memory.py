@@ -0,0 +1,101 @@
+# # #
+# Accounting of memory used by a piece of code
+#
+#   with memory.Meter() as meter:
+#       solve(...)
+#   meter.peak_rss, meter.peak_blocks, meter.blocks
+#
+# Two measures are taken:
+#   - peak resident set size of the process (bytes). On Linux, the peak is
+#     reset when the meter starts (by writing 5 to /proc/self/clear_refs), so
+#     it is the peak during the measured code. Elsewhere it is the peak over
+#     the lifetime of the process, ru_maxrss.
+#   - number of memory blocks allocated by Python (sys.getallocatedblocks):
+#     the largest number seen while the code runs and the number still
+#     allocated at the end, both relative to the start. The largest number is
+#     sampled by a thread, so short spikes can be missed.
+#
+
+import sys
+import resource
+import threading
+from typing import Optional
+
+# how often the number of allocated blocks is sampled, seconds
+SAMPLE_INTERVAL = 0.001
+
+
+def reset_peak() -> bool:
+    """Reset peak resident set size of the process. Return True on success"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as fd:
+            fd.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _status(field: str) -> Optional[int]:
+    """Read a field given in kB from /proc/self/status, in bytes"""
+    try:
+        with open('/proc/self/status') as fd:
+            for line in fd:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss() -> int:
+    """Peak resident set size of the process, in bytes"""
+    peak = _status('VmHWM')
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != 'darwin':
+            # in KiB everywhere but on macOS
+            peak *= 1024
+    return peak
+
+
+def current_rss() -> Optional[int]:
+    """Current resident set size of the process, in bytes, if known"""
+    return _status('VmRSS')
+
+
+class Meter(object):
+    """Context manager that measures memory used by the enclosed code"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_rss = None
+        self.blocks = None
+        self.peak_blocks = None
+        self._start_blocks = 0
+        self._max_blocks = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self._max_blocks = max(self._max_blocks, sys.getallocatedblocks())
+
+    def __enter__(self):
+        reset_peak()
+        self._start_blocks = self._max_blocks = sys.getallocatedblocks()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        end_blocks = sys.getallocatedblocks()
+        self.peak_rss = peak_rss()
+        self.blocks = end_blocks - self._start_blocks
+        self.peak_blocks = max(self._max_blocks, end_blocks) - \
+            self._start_blocks
+
+    def as_dict(self) -> dict:
+        return {'peak_rss': self.peak_rss, 'blocks': self.blocks,
+                'peak_blocks': self.peak_blocks}
@@ -0,0 +1,165 @@
+# # #
+# Counters and histograms of operations in hot code
+#
+# Timings tell how long something took, counts tell why. Solutions get named
+# metrics from the registry and update them:
+#
+#   from aoc import metrics
+#
+#   recodes = metrics.counter('recode')
+#   for ...:
+#       recodes.inc()
+#   metrics.histogram('reduce steps').observe(steps)
+#
+#   print(metrics.report())
+#
+# Metrics are disabled unless the environment variable AOC_METRICS is set
+# to 1 or metrics.enable() is called. While disabled, counter() and
+# histogram() return shared objects whose methods do nothing. Whether metrics
+# are enabled is checked when a metric is requested, so get metrics in the
+# function that uses them rather than at module level, and outside of the
+# innermost loops. Where possible, count in a local variable and add the total
+# with one call of inc().
+#
+# The runner reports the metrics of every part and includes them in its JSON
+# output.
+#
+
+import os
+import math
+from typing import Dict, List, Optional
+
+from aoc import utils
+
+_enabled = bool(int(os.environ.get('AOC_METRICS', 0)))
+
+_counters: Dict[str, 'Counter'] = {}
+_histograms: Dict[str, 'Histogram'] = {}
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Forget all metrics"""
+    _counters.clear()
+    _histograms.clear()
+
+
+class Counter(object):
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, n: int = 1):
+        self.value += n
+
+
+class Histogram(object):
+    """Distribution of observed values: count, sum, min, max and counts of
+    values in power-of-two buckets (bucket k holds values v with
+    2^(k-1) <= v < 2^k, bucket 0 holds values below 1)"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets: Dict[int, int] = {}
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        bucket = 0 if value < 1 else math.frexp(value)[1]
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+
+class NullMetric(object):
+    """Counter and histogram in one that ignores everything"""
+
+    __slots__ = ()
+
+    def inc(self, n: int = 1):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+_NULL_METRIC = NullMetric()
+
+
+def counter(name: str):
+    """Get the counter of given name, creating it if needed"""
+    if not _enabled:
+        return _NULL_METRIC
+    metric = _counters.get(name)
+    if metric is None:
+        metric = _counters[name] = Counter()
+    return metric
+
+
+def histogram(name: str):
+    """Get the histogram of given name, creating it if needed"""
+    if not _enabled:
+        return _NULL_METRIC
+    metric = _histograms.get(name)
+    if metric is None:
+        metric = _histograms[name] = Histogram()
+    return metric
+
+
+def snapshot() -> dict:
+    """Return all metrics as a JSON-serializable dictionary"""
+    return {
+        'counters': {name: c.value for name, c in sorted(_counters.items())},
+        'histograms': {
+            name: {
+                'count': h.count,
+                'sum': h.total,
+                'min': h.min,
+                'max': h.max,
+                'mean': h.total / h.count if h.count else None,
+                # keys of JSON objects are strings anyway
+                'buckets': {str(k): v for k, v in sorted(h.buckets.items())},
+            }
+            for name, h in sorted(_histograms.items())
+        },
+    }
+
+
+def _num(value) -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, float) and not value.is_integer():
+        return "{:.2f}".format(value)
+    return str(int(value))
+
+
+def report(data: Optional[dict] = None) -> str:
+    """Make a text table of given (or current) metrics"""
+    if data is None:
+        data = snapshot()
+    rows: List[tuple] = [("Metric", "Count", "Sum", "Min", "Mean", "Max")]
+    for name, value in data['counters'].items():
+        rows.append((name, _num(value), '', '', '', ''))
+    for name, h in data['histograms'].items():
+        rows.append((name, _num(h['count']), _num(h['sum']), _num(h['min']),
+                     _num(h['mean']), _num(h['max'])))
+    if len(rows) == 1:
+        return "No metrics recorded"
+    return utils.tabulate(rows, 1)
@@ -0,0 +1,117 @@
+# # #
+# Run solutions in worker subprocesses with limits on time and memory
+#
+# Some solutions can run away on bad or large inputs. The orchestrator runs
+# every part of every day in its own subprocess (python -m aoc.orchestrator
+# DAY PART) and, using asyncio, waits for at most <jobs> of them at a time:
+#
+#   - a worker that runs longer than <timeout> seconds is killed and its
+#     record gets 'timeout': True;
+#   - a worker is not allowed to allocate more than <max_memory> bytes of
+#     address space (RLIMIT_AS), allocations beyond that fail with
+#     MemoryError;
+#   - when the run is interrupted (Ctrl-C), all workers are killed.
+#
+# Either way, the other workers keep going. The runner switches to the
+# orchestrator when a limit is given:
+#
+#   python -m aoc run --timeout 10 --max-memory 1024
+#
+
+import os
+import sys
+import json
+import signal
+import asyncio
+import resource
+import contextlib
+from typing import List, Tuple, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _limit_memory(max_memory: int):
+    def preexec():
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+    return preexec
+
+
+def _failure(returncode: int, stderr: str) -> str:
+    """Describe why a worker did not produce a record"""
+    if returncode < 0:
+        reason = "killed by {}".format(signal.Signals(-returncode).name)
+    else:
+        reason = f"worker exited with code {returncode}"
+    lines = stderr.strip().splitlines()
+    return reason + (": " + lines[-1] if lines else '')
+
+
+async def run_worker(day: int, part: int, timeout: Optional[float] = None,
+                     max_memory: Optional[int] = None,
+                     verbose: bool = False) -> dict:
+    """Solve given part of given day in a subprocess and return the record
+    made by runner.run_part()"""
+    res = {'day': day, 'part': part, 'answer': None, 'error': None,
+           'parse': None, 'solve': None}
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, '-m', 'aoc.orchestrator', str(day), str(part),
+        '1' if verbose else '0',
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        cwd=ROOT,
+        preexec_fn=_limit_memory(max_memory) if max_memory else None)
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        res['timeout'] = True
+        res['error'] = f"timed out after {timeout} s"
+        return res
+    finally:
+        # on timeout and on cancellation the worker is still running
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+    stderr = stderr.decode(errors='replace')
+    if verbose and stderr:
+        print(stderr, end='', file=sys.stderr)
+    try:
+        return json.loads(stdout)
+    except ValueError:
+        res['error'] = _failure(proc.returncode, stderr)
+        return res
+
+
+async def run_all(tasks: List[Tuple[int, int]], jobs: Optional[int] = None,
+                  timeout: Optional[float] = None,
+                  max_memory: Optional[int] = None,
+                  verbose: bool = False) -> List[dict]:
+    """Run workers for given (day, part) tasks, at most <jobs> at a time.
+    Return records in the order of the tasks."""
+    slots = asyncio.Semaphore(jobs or os.cpu_count())
+
+    async def run_one(day: int, part: int) -> dict:
+        async with slots:
+            return await run_worker(day, part, timeout, max_memory, verbose)
+
+    return await asyncio.gather(*(run_one(day, part) for day, part in tasks))
+
+
+def run(tasks: List[Tuple[int, int]], jobs: Optional[int] = None,
+        timeout: Optional[float] = None, max_memory: Optional[int] = None,
+        verbose: bool = False) -> List[dict]:
+    """Synchronous wrapper of run_all()"""
+    return asyncio.run(run_all(tasks, jobs, timeout, max_memory, verbose))
+
+
+def worker(day: int, part: int, verbose: bool = False):
+    """Solve given part of given day and print the record as JSON.
+    What the solution prints goes to stderr."""
+    from aoc import runner
+
+    with contextlib.redirect_stdout(sys.stderr):
+        record = runner.run_part(day, part, verbose)
+    print(json.dumps(record))
+
+
+if __name__ == '__main__':
+    worker(int(sys.argv[1]), int(sys.argv[2]), sys.argv[3] == '1')
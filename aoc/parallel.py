@@ -0,0 +1,274 @@
+# # #
+# Chunked map-reduce over the lines of an input file, in worker processes
+#
+# Many days reduce the input line by line with an associative operation: sums
+# of numbers, counts of bits, scores of lines. Such a day can split the input
+# into chunks, solve every chunk in its own process and combine the partial
+# results. A day module that supports it provides the dictionary
+#
+#   PARALLEL = {1: parallel.MapReduce(mapper, reducer, ...), 2: ...}
+#
+# where
+#   mapper(lines)       -- computes the partial result of a chunk of lines.
+#                          It runs in a worker process, so it must be
+#                          picklable: a module level function or a
+#                          functools.partial of one;
+#   reducer(a, b)       -- combines partial results of two adjacent chunks,
+#                          <a> comes before <b> in the input. It must be
+#                          associative, but not necessarily commutative;
+#   finish(partial)     -- turns the combined result into the answer
+#                          (default: the combined result is the answer);
+#   overlap             -- for days that look at a window of <overlap> + 1
+#                          consecutive lines: every chunk gets the <overlap>
+#                          lines that precede it prepended, so that windows
+#                          across the boundary are seen by exactly one chunk,
+#                          the one that holds the last line of the window.
+#   raw                 -- the mapper gets the bytes of the chunk instead of
+#                          a list of lines, for mappers that parse the whole
+#                          chunk at once (numpy). Lines are not decoded.
+#
+# Partial results are combined pairwise in a balanced tree (tree_reduce()),
+# not folded from the left: adjacent partials only, so the order is kept and
+# any associative reducer gives the same answer, but a long run of chunks
+# takes log2(chunks) rounds of reducer calls on operands of the same size.
+#
+# The file is memory mapped and split into byte ranges on line boundaries;
+# workers read only their own range (plus the overlap), the lines are never
+# sent between processes. Only partial results are.
+#
+#   python -m aoc parallel 1 2 big.txt -j 4
+#
+# With --bench, the input is solved serially (load_input() and solve_pN, as
+# the runner does) and in parallel with 1, 2, 4, ... up to <jobs> processes.
+# The table shows the best time of <repeat> runs, the throughput in MB/s of
+# the input and the speedup against the serial solution; all answers must
+# be the same.
+#
+#   python -m aoc parallel 1 2 big.txt -j 8 --bench
+#
+
+import os
+import sys
+import time
+import operator
+import functools
+import itertools
+from typing import List, Tuple, Callable, Optional, Any
+
+from aoc import utils
+
+
+def add_tuples(a: tuple, b: tuple) -> tuple:
+    """Reducer that adds tuples elementwise, the shorter padded with zeros"""
+    return tuple(itertools.starmap(
+        operator.add, itertools.zip_longest(a, b, fillvalue=0)))
+
+
+def tree_reduce(reducer: Callable[[Any, Any], Any], items: List) -> Any:
+    """Reduce the items with an associative reducer by combining adjacent
+    pairs, round after round, until one item is left. Same result as
+    functools.reduce() but with a tree of depth log2(len(items))."""
+    if not items:
+        raise TypeError("tree_reduce() of empty sequence")
+    while len(items) > 1:
+        paired = [reducer(a, b) for a, b in zip(items[::2], items[1::2])]
+        if len(items) % 2:
+            paired.append(items[-1])
+        items = paired
+    return items[0]
+
+
+def chunk_ranges(data, chunks: int) -> List[Tuple[int, int]]:
+    """Split bytes-like <data> into at most <chunks> byte ranges [start, end)
+    of about the same size that start and end on line boundaries"""
+    size = len(data)
+    ranges = []
+    start = 0
+    for idx in range(1, chunks + 1):
+        if start >= size:
+            break
+        end = size if idx == chunks else size * idx // chunks
+        if end < size:
+            # move the end after the end of the line it falls into
+            nl = data.find(b'\n', max(end - 1, start))
+            end = size if nl < 0 else nl + 1
+        if end > start:
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def context_start(data, start: int, lines: int) -> int:
+    """Return the offset of the line that is <lines> lines before the line
+    starting at offset <start> (or 0 if there are not that many lines)"""
+    pos = start
+    for _ in range(lines):
+        if pos <= 0:
+            return 0
+        # pos - 1 is the end of the previous line
+        nl = data.rfind(b'\n', 0, pos - 1)
+        pos = nl + 1
+    return pos
+
+
+def decode_lines(chunk: bytes) -> List[str]:
+    """Split a chunk of the file into lines as utils.load_input() does"""
+    lines = chunk.decode().split('\n')
+    if lines and not lines[-1]:
+        # the chunk ends with a line break
+        lines.pop()
+    return [line.rstrip('\r') for line in lines]
+
+
+def map_chunk(mapper: Callable, fname: str, start: int, end: int,
+              raw: bool = False):
+    """Apply the mapper to the lines (or the bytes, if <raw>) in the byte
+    range of the file"""
+    with utils.MappedInput(fname) as mapped:
+        chunk = mapped.data[start:end]
+    return mapper(chunk if raw else decode_lines(chunk))
+
+
+class MapReduce(object):
+    """Parallel solution of a part of a day, see the header"""
+
+    def __init__(self, mapper: Callable[[List[str]], Any],
+                 reducer: Callable[[Any, Any], Any],
+                 finish: Optional[Callable[[Any], Any]] = None,
+                 overlap: int = 0, raw: bool = False):
+        self.mapper = mapper
+        self.reducer = reducer
+        self.finish = finish
+        self.overlap = overlap
+        self.raw = raw
+
+    def ranges(self, data, chunks: int) -> List[Tuple[int, int]]:
+        """Byte ranges of the chunks, including the overlap"""
+        return [(context_start(data, start, self.overlap), end)
+                for start, end in chunk_ranges(data, chunks)]
+
+    def empty(self) -> Any:
+        """Partial result of an empty input"""
+        return self.mapper(b'' if self.raw else [])
+
+    def combine(self, partials: List) -> Any:
+        res = tree_reduce(self.reducer, partials)
+        return self.finish(res) if self.finish else res
+
+    def run(self, fname: str, jobs: Optional[int] = None,
+            chunks: Optional[int] = None) -> Any:
+        """Solve the input in the file with <jobs> worker processes (default:
+        all cores) and <chunks> chunks (default: one per job). With one job,
+        the chunks are solved in this process."""
+        jobs = jobs or os.cpu_count()
+        with utils.MappedInput(fname) as mapped:
+            ranges = self.ranges(mapped.data, chunks or jobs)
+        if not ranges:
+            # empty input
+            return self.combine([self.empty()])
+        if jobs == 1:
+            partials = [map_chunk(self.mapper, fname, start, end, self.raw)
+                        for start, end in ranges]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(map_chunk, self.mapper, fname,
+                                       start, end, self.raw)
+                           for start, end in ranges]
+                partials = [future.result() for future in futures]
+        return self.combine(partials)
+
+    def run_lines(self, lines: List[str], chunks: int = 2) -> Any:
+        """Same as run() for lines in memory, in this process. Chunks have
+        the same number of lines. Meant for tests of mappers and reducers."""
+        size = max(1, -(-len(lines) // chunks))
+        chunks = [lines[max(0, start - self.overlap):start + size]
+                  for start in range(0, len(lines), size)]
+        if self.raw:
+            chunks = ["".join(line + "\n" for line in chunk).encode()
+                      for chunk in chunks]
+        partials = [self.mapper(chunk) for chunk in chunks]
+        return self.combine(partials or [self.empty()])
+
+
+def solve_serial(module, part: int, fname: str) -> Any:
+    """Solve the input in the file as the runner does"""
+    from aoc import runner
+
+    lines = utils.load_input(fname)
+    solve = getattr(module, f"solve_p{part}")
+    return solve(*runner.prepare_args(module, lines, part))
+
+
+def job_counts(jobs: int) -> List[int]:
+    """1, 2, 4, ... up to <jobs>, and <jobs> itself"""
+    counts = [1]
+    while counts[-1] * 2 < jobs:
+        counts.append(counts[-1] * 2)
+    if jobs > 1:
+        counts.append(jobs)
+    return counts
+
+
+def bench(module, part: int, fname: str, jobs: int,
+          chunks: Optional[int] = None, repeat: int = 3) -> List[dict]:
+    """Best time of <repeat> runs of the serial solution and of the parallel
+    one with every number of jobs of job_counts(<jobs>)"""
+    solver = module.PARALLEL[part]
+    runs = [('serial', functools.partial(solve_serial, module, part, fname))]
+    runs.extend((n, functools.partial(solver.run, fname, n, chunks))
+                for n in job_counts(jobs))
+    records = []
+    for label, solve in runs:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            answer = solve()
+            times.append(time.perf_counter() - start)
+        records.append({'jobs': label, 'answer': str(answer),
+                        'time': min(times)})
+    return records
+
+
+def format_bench(records: List[dict], size: int) -> str:
+    serial = records[0]
+    rows = [("Jobs", "Time, ms", "MB/s", "Speedup", "Answer", "Status")]
+    for r in records:
+        rows.append((str(r['jobs']), "{:.1f}".format(r['time'] * 1000),
+                     "{:.1f}".format(size / r['time'] / 1e6),
+                     "{:.2f}x".format(serial['time'] / r['time']),
+                     r['answer'][:20],
+                     'ok' if r['answer'] == serial['answer'] else 'MISMATCH'))
+    return utils.tabulate(rows, 1)
+
+
+def main(args) -> int:
+    """Solve a part of a day with its parallel solution"""
+    from aoc import runner
+
+    module = runner.import_day(args.day)
+    solvers = getattr(module, 'PARALLEL', {})
+    if args.part not in solvers:
+        print(f"Day {args.day:02d} p.{args.part} has no parallel solution",
+              file=sys.stderr)
+        return 1
+
+    fname = args.input or runner.input_file(args.day)
+    if args.bench:
+        records = bench(module, args.part, fname, args.jobs or os.cpu_count(),
+                        args.chunks, args.repeat)
+        size = os.path.getsize(fname)
+        print("Day {:02d} p.{}, {}, {:.1f} MB".format(
+            args.day, args.part, fname, size / 1e6))
+        print(format_bench(records, size))
+        return 0 if len({r['answer'] for r in records}) == 1 else 1
+
+    start = time.perf_counter()
+    answer = solvers[args.part].run(fname, args.jobs, args.chunks)
+    elapsed = time.perf_counter() - start
+    print(answer)
+    if args.verbose:
+        print("Solved in {:.2f} ms with {} jobs".format(
+            elapsed * 1000, args.jobs or os.cpu_count()), file=sys.stderr)
+    return 0
@@ -0,0 +1,145 @@
+# # #
+# Profiling of the solutions with cProfile and tracemalloc
+#
+# When the environment variable AOC_PROFILE is set to 1, the runner wraps the
+# call to solve_p1/solve_p2 of every day in a Profile and writes a report to
+# profiles/dayDD.pN.txt (the directory can be changed with AOC_PROFILE_DIR):
+#
+#   AOC_PROFILE=1 python -m aoc run --days 18,20
+#
+# The report has
+#   - functions sorted by cumulative time and by own time (cProfile),
+#   - peak size of memory allocated by Python during the call,
+#   - lines of code that allocated the memory still held when the call
+#     returns (tracemalloc traces only allocations made during the call).
+#
+# Both profilers slow the code down several times, so timings in the table of
+# the runner are not comparable with normal runs. Answers are never taken from
+# the result cache when profiling.
+#
+
+import io
+import os
+import pstats
+import cProfile
+import tracemalloc
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_DIR = os.environ.get('AOC_PROFILE_DIR', os.path.join(ROOT, 'profiles'))
+
+# how many functions and allocation sites to show
+TOP = 25
+
+# frames of the profilers and the import machinery are not interesting
+_FILTERS = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_enabled = bool(int(os.environ.get('AOC_PROFILE', 0)))
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def report_file(day: int, part: int) -> str:
+    return os.path.join(PROFILE_DIR, f"day{day:02d}.p{part}.txt")
+
+
+def _size(nbytes: int) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(nbytes) < 1024:
+            return f"{nbytes:.1f} {unit}" if unit != 'B' else f"{nbytes} B"
+        nbytes /= 1024
+    return f"{nbytes:.1f} GiB"
+
+
+class Profile(object):
+    """Context manager that runs the enclosed code under cProfile and
+    tracemalloc"""
+
+    def __init__(self, top: int = TOP):
+        self.top = top
+        self.profiler = cProfile.Profile()
+        self.peak = None
+        self.snapshot = None
+
+    def __bool__(self):
+        return True
+
+    def __enter__(self):
+        tracemalloc.start()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.disable()
+        self.peak = tracemalloc.get_traced_memory()[1]
+        self.snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        tracemalloc.stop()
+
+    def report(self, title: str = '') -> str:
+        out = io.StringIO()
+        if title:
+            print(f"=== {title} ===\n", file=out)
+
+        print(f"Peak memory: {_size(self.peak)}\n", file=out)
+
+        print(f"--- Top {self.top} allocation sites (memory held at the end)"
+              " ---", file=out)
+        for stat in self.snapshot.statistics('lineno')[:self.top]:
+            frame = stat.traceback[0]
+            fname = os.path.relpath(frame.filename, ROOT) \
+                if frame.filename.startswith(ROOT) else frame.filename
+            print("{:>12} {:>9} blocks  {}:{}".format(
+                _size(stat.size), stat.count, fname, frame.lineno), file=out)
+
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.strip_dirs()
+        for key in ('cumulative', 'tottime'):
+            print(f"\n--- Top {self.top} functions by {key} time ---",
+                  file=out)
+            stats.sort_stats(key).print_stats(self.top)
+
+        return out.getvalue()
+
+    def save(self, fname: str, title: str = '') -> str:
+        """Write the report to the file <fname> and return its path"""
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        with open(fname, 'w') as fd:
+            fd.write(self.report(title))
+        return fname
+
+
+class NullProfile(object):
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_PROFILE = NullProfile()
+
+
+def profile(top: Optional[int] = None):
+    """Context manager that profiles the enclosed code if profiling is
+    enabled. The returned object is false if it is not."""
+    return Profile(top or TOP) if _enabled else _NULL_PROFILE
@@ -0,0 +1,354 @@
+# # #
+# Run the solutions of many days at once, in a pool of processes, and check
+# the results against the answers recorded in day_XX/answer.txt
+#
+# A day module is expected to provide the functions solve_p1 and solve_p2.
+# By default, both are called with the lines of the input file. If a day needs
+# its input in a different form, the module can provide the function
+#
+#   prepare_input(lines: List[str], part: int) -> tuple
+#
+# that returns positional arguments for the call to solve_p1/solve_p2.
+#
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import importlib
+import contextlib
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Iterable
+
+from aoc import utils
+from aoc import spans
+from aoc import metrics
+from aoc import cache
+from aoc import memory
+from aoc import profiling
+from aoc import orchestrator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARTS = (1, 2)
+
+
+def parse_days(spec: str) -> List[int]:
+    """Parse a specification of days like "1-21" or "1,3,5-7" into a sorted
+    list of day numbers."""
+    days = set()
+    for field in spec.split(','):
+        field = field.strip()
+        if not field:
+            continue
+        if '-' in field:
+            start, end = map(int, field.split('-', 1))
+            days.update(range(start, end + 1))
+        else:
+            days.add(int(field))
+    return sorted(days)
+
+
+def discover_days(days: Optional[Iterable[int]] = None) -> List[int]:
+    """Return numbers of days that have a solution module. If <days> is given,
+    only those of them are returned that actually exist."""
+    found = []
+    for name in sorted(os.listdir(ROOT)):
+        m = re.fullmatch(r'day_(\d\d)', name)
+        if m and os.path.isfile(os.path.join(ROOT, name, 'solution.py')):
+            found.append(int(m[1]))
+    if days is not None:
+        wanted = set(days)
+        found = [day for day in found if day in wanted]
+    return found
+
+
+def day_dir(day: int) -> str:
+    return os.path.join(ROOT, f"day_{day:02d}")
+
+
+def input_file(day: int) -> str:
+    return os.path.join(day_dir(day), 'input.txt')
+
+
+def import_day(day: int):
+    """Import the module day_XX.solution"""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    return importlib.import_module(f"day_{day:02d}.solution")
+
+
+def load_answers(day: int) -> Dict[int, Optional[str]]:
+    """Read expected answers from the file answer.txt (or answers.txt) that
+    contains the output of running the solution of the day. The answer to
+    part N is the expected value from the 1st result line that follows the
+    header "--- Day DD p.N ---". Unknown answers (-1) are returned as None.
+    """
+    answers = {part: None for part in PARTS}
+    for fname in ('answer.txt', 'answers.txt'):
+        path = os.path.join(day_dir(day), fname)
+        if os.path.exists(path):
+            break
+    else:
+        return answers
+
+    part = None
+    for line in utils.load_input(path):
+        m = re.fullmatch(r'--- Day \d+ p\.(\d) ---', line.strip())
+        if m:
+            part = int(m[1])
+            continue
+        m = re.fullmatch(r'(True|False) (\S+) (\S+)', line.strip())
+        if m and part is not None:
+            if m[2] != '-1':
+                answers[part] = m[2]
+            part = None
+    return answers
+
+
+def prepare_args(module, lines: List[str], part: int) -> tuple:
+    """Turn lines of the input into arguments for solve_p1/solve_p2"""
+    prepare = getattr(module, 'prepare_input', None)
+    return prepare(lines, part) if prepare else (lines,)
+
+
+def run_part(day: int, part: int, verbose: bool = False) -> dict:
+    """Solve given part of given day on the real input and return a record
+    with the answer, timings (in seconds) and memory used by parsing and
+    solving (see aoc.memory)"""
+    res = {'day': day, 'part': part, 'answer': None, 'error': None,
+           'parse': None, 'solve': None,
+           'peak_rss': None, 'blocks': None, 'peak_blocks': None}
+    out = sys.stdout if verbose else io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            module = import_day(day)
+            solve = getattr(module, f"solve_p{part}")
+            with memory.Meter() as meter:
+                start = time.perf_counter()
+                with spans.span('parse'):
+                    lines = utils.load_input(input_file(day))
+                    args = prepare_args(module, lines, part)
+                res['parse'] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                with spans.span('solve'), profiling.profile() as prof:
+                    answer = solve(*args)
+                res['solve'] = time.perf_counter() - start
+            res.update(meter.as_dict())
+            if prof:
+                res['profile'] = prof.save(
+                    profiling.report_file(day, part),
+                    f"Day {day:02d} p.{part}: {answer}")
+            res['answer'] = str(answer)
+        except Exception as ex:
+            res['error'] = "{}: {}".format(type(ex).__name__, ex)
+    if spans.enabled():
+        res['spans'] = spans.stats()
+    if metrics.enabled():
+        res['metrics'] = metrics.snapshot()
+    return res
+
+
+def check(record: dict, expected: Optional[str]) -> str:
+    if record.get('timeout'):
+        return 'TIMEOUT'
+    if record['error']:
+        return 'ERROR'
+    if expected is None:
+        return '?'
+    return 'ok' if record['answer'] == expected else 'FAIL'
+
+
+def run(days: List[int], parts=PARTS, jobs: Optional[int] = None,
+        verbose: bool = False, use_cache: bool = True,
+        timeout: Optional[float] = None,
+        max_memory: Optional[int] = None) -> List[dict]:
+    """Run solutions of given days and parts in a pool of <jobs> processes.
+    Return records sorted by day and part.
+
+    Every part runs in a fresh process because solutions may keep state at
+    module level (caches, counters, patched classes of other days).
+
+    If <use_cache> is set, answers are taken from the result cache whenever
+    neither the input nor the code of the solution changed since the answer
+    was computed. Profiling, spans and metrics (AOC_PROFILE, AOC_SPANS,
+    AOC_METRICS) turn the cache off: cached answers have none of them.
+
+    If <timeout> (seconds) or <max_memory> (bytes) is given, the parts run
+    in worker subprocesses of the orchestrator that enforces these limits.
+    """
+    records = []
+    use_cache = use_cache and not (profiling.enabled() or spans.enabled()
+                                   or metrics.enabled())
+    results = cache.ResultCache() if use_cache else None
+    keys = {}
+    tasks = []
+    for day in days:
+        for part in parts:
+            if results:
+                key = results.make_key(day, part, input_file(day))
+                cached = results.get(key)
+                if cached is not None:
+                    cached['cached'] = True
+                    records.append(cached)
+                    continue
+                keys[day, part] = key
+            tasks.append((day, part))
+
+    if timeout or max_memory:
+        solved = orchestrator.run(tasks, jobs, timeout, max_memory, verbose)
+    else:
+        solved = []
+        with ProcessPoolExecutor(max_workers=jobs,
+                                 max_tasks_per_child=1) as pool:
+            futures = [pool.submit(run_part, day, part, verbose)
+                       for day, part in tasks]
+            for future in as_completed(futures):
+                solved.append(future.result())
+
+    for record in solved:
+        records.append(record)
+        if results and record['error'] is None:
+            results.put(keys[record['day'], record['part']],
+                        {k: v for k, v in record.items()
+                         if k not in {'spans', 'metrics', 'profile'}})
+    if results:
+        results.save_stats()
+
+    records.sort(key=lambda r: (r['day'], r['part']))
+    for record in records:
+        expected = load_answers(record['day'])[record['part']]
+        record['expected'] = expected
+        record['status'] = check(record, expected)
+    return records
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return '-' if seconds is None else "{:.1f}".format(seconds * 1000)
+
+
+def _mib(nbytes: Optional[int]) -> str:
+    return '-' if nbytes is None else "{:.1f}".format(nbytes / 2**20)
+
+
+def _count(value: Optional[int]) -> str:
+    return '-' if value is None else str(value)
+
+
+def format_table(records: List[dict]) -> str:
+    """Make a text table with answers, timings and memory"""
+    rows = [("Day", "Part", "Status", "Answer", "Expected",
+             "Parse, ms", "Solve, ms", "Peak RSS, MiB", "Peak blocks")]
+    for r in records:
+        # some errors (e.g. failed imports) have long multiline messages
+        answer = r['answer'] if r['error'] is None else \
+            " ".join(r['error'].split())[:60]
+        measures = (_ms(r['parse']), _ms(r['solve']),
+                    _mib(r.get('peak_rss')), _count(r.get('peak_blocks')))
+        if r.get('cached'):
+            measures = ('-', 'cached', '-', '-')
+        rows.append((f"{r['day']:02d}", str(r['part']), r['status'],
+                     answer, r['expected'] or '-') + measures)
+    return utils.tabulate(rows, 3)
+
+
+def _import_times(code: str) -> Dict[str, tuple]:
+    """Run the code in a fresh interpreter with -X importtime and return
+    {module: (cumulative time in seconds, nesting level)} of every module it
+    imports, in the order of the report"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [ROOT] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          env=env, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True)
+    if proc.returncode:
+        lines = proc.stderr.strip().splitlines()
+        raise ImportError(lines[-1] if lines else "exit code {}".format(
+            proc.returncode))
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if m:
+            level = (len(m.group(3)) - 1) // 2
+            times[m.group(4)] = (int(m.group(2)) / 1e6, level)
+    return times
+
+
+def time_import(day: int, baseline: Iterable[str] = ()) -> dict:
+    """Measure time of importing the solution module of given day in a fresh
+    interpreter (python -X importtime), including all modules it imports
+    that the interpreter does not import at startup (<baseline>)"""
+    res = {'day': day, 'error': None, 'time': None, 'modules': None}
+    try:
+        times = _import_times(f"import day_{day:02d}.solution")
+    except Exception as ex:
+        res['error'] = "{}: {}".format(type(ex).__name__, ex)
+        return res
+    baseline = set(baseline)
+    new = {name: t for name, t in times.items() if name not in baseline}
+    res['time'] = sum(cumulative for cumulative, level in new.values()
+                      if level == 0)
+    res['modules'] = len(new)
+    return res
+
+
+def imports_main(args) -> int:
+    """Print time of importing the solution module of every day, each in a
+    fresh interpreter, from the current directory (whatever it is)"""
+    days = discover_days(parse_days(args.days) if args.days else None)
+    baseline = _import_times("pass")
+    records = [time_import(day, baseline) for day in days]
+    rows = [("Day", "Import, ms", "New modules")]
+    for r in records:
+        if r['error']:
+            rows.append((f"{r['day']:02d}", r['error'], ''))
+        else:
+            rows.append((f"{r['day']:02d}", _ms(r['time']), str(r['modules'])))
+    print(utils.tabulate(rows, 1))
+    return 1 if any(r['error'] for r in records) else 0
+
+
+def main(args) -> int:
+    days = discover_days(parse_days(args.days) if args.days else None)
+    parts = parse_days(args.parts) if args.parts else PARTS
+
+    start = time.perf_counter()
+    max_memory = args.max_memory * 2**20 if args.max_memory else None
+    records = run(days, parts, args.jobs, args.verbose, not args.no_cache,
+                  args.timeout, max_memory)
+    elapsed = time.perf_counter() - start
+
+    print(format_table(records))
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump(records, fd, indent=2)
+            fd.write('\n')
+        print(f"\nResults saved to {args.output}")
+    for r in records:
+        if r.get('spans'):
+            print(f"\n--- Spans of day {r['day']:02d} p.{r['part']} ---")
+            print(spans.report(r['spans']))
+    for r in records:
+        if r.get('metrics'):
+            print(f"\n--- Metrics of day {r['day']:02d} p.{r['part']} ---")
+            print(metrics.report(r['metrics']))
+    profiles = [r['profile'] for r in records if r.get('profile')]
+    if profiles:
+        print("\nProfiles saved to {}".format(
+            os.path.commonpath(profiles) if len(profiles) > 1
+            else profiles[0]))
+    timeouts = [r for r in records if r['status'] == 'TIMEOUT']
+    if timeouts:
+        print("\nTimed out: {}".format(", ".join(
+            "day {:02d} p.{}".format(r['day'], r['part']) for r in timeouts)))
+    failed = [r for r in records
+              if r['status'] in {'FAIL', 'ERROR', 'TIMEOUT'}]
+    print("\nDays: {}, parts: {}, cached: {}, failed: {}, wall time: {:.2f} s"
+          .format(len(days), len(records),
+                  sum(1 for r in records if r.get('cached')),
+                  len(failed), elapsed))
+    return 1 if failed else 0
@@ -0,0 +1,125 @@
+# # #
+# Scaling curves: how time and memory of a solution grow with the size of
+# the input. Inputs are made by aoc.generators.
+#
+#   python -m aoc scale --days 5,12 --sizes 100,200,400,800
+#
+# Every measurement runs in a fresh process. Memory is the peak resident set
+# size during the call of the solution (see aoc.memory, the peak is reset
+# before the call) less the resident set size at the start of the call, so
+# it shows memory the solution allocates itself, however much the process
+# used before (generating and preparing the input).
+# The exponent k in the summary is the slope of the least squares line in
+# log-log coordinates, i.e. time ~ size^k.
+#
+
+import io
+import json
+import math
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from aoc import utils
+from aoc import runner
+from aoc import memory
+from aoc import generators
+
+
+def measure(day: int, part: int, size: int, seed: int = 2021) -> dict:
+    """Solve given part of given day on a generated input of given size"""
+    res = {'day': day, 'part': part, 'size': size, 'answer': None,
+           'error': None, 'time': None, 'memory': None}
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            module = runner.import_day(day)
+            lines = generators.generate(day, size, seed)
+            args = runner.prepare_args(module, lines, part)
+            solve = getattr(module, f"solve_p{part}")
+            before = memory.current_rss() or 0
+            with memory.Meter() as meter:
+                start = time.perf_counter()
+                answer = solve(*args)
+                res['time'] = time.perf_counter() - start
+            res['memory'] = max(0, meter.peak_rss - before)
+            res['answer'] = str(answer)
+        except Exception as ex:
+            res['error'] = "{}: {}".format(type(ex).__name__, ex)
+    return res
+
+
+def exponent(sizes: List[float], values: List[float]) -> Optional[float]:
+    """Slope of the least squares line through (log size, log value)"""
+    points = [(math.log(s), math.log(v))
+              for s, v in zip(sizes, values) if s > 0 and v and v > 0]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    if not sxx:
+        return None
+    return sum((x - mx) * (y - my) for x, y in points) / sxx
+
+
+def run(days: List[int], parts=runner.PARTS, sizes: Optional[List[int]] = None,
+        jobs: int = 1, seed: int = 2021) -> List[dict]:
+    tasks = []
+    for day in days:
+        _, _, default_sizes, day_parts = generators.GENERATORS[day]
+        for part in parts:
+            if part in day_parts:
+                for size in sizes or default_sizes:
+                    tasks.append((day, part, size, seed))
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(measure, *task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+def _fmt_exp(k: Optional[float]) -> str:
+    return '-' if k is None else "n^{:.2f}".format(k)
+
+
+def format_table(records: List[dict]) -> str:
+    rows = [("Day", "Part", "Size", "Time, ms", "Memory, KiB", "Answer")]
+    for r in records:
+        if r['error']:
+            rows.append((f"{r['day']:02d}", str(r['part']), str(r['size']),
+                         '-', '-', r['error']))
+            continue
+        rows.append((f"{r['day']:02d}", str(r['part']), str(r['size']),
+                     "{:.2f}".format(r['time'] * 1000),
+                     str(r['memory'] // 1024), r['answer'][:20]))
+    table = utils.tabulate(rows, 2)
+
+    rows = [("Day", "Part", "Size is", "Time", "Memory")]
+    groups = {}
+    for r in records:
+        if not r['error']:
+            groups.setdefault((r['day'], r['part']), []).append(r)
+    for (day, part), group in groups.items():
+        sizes = [r['size'] for r in group]
+        rows.append((f"{day:02d}", str(part), generators.GENERATORS[day][1],
+                     _fmt_exp(exponent(sizes, [r['time'] for r in group])),
+                     _fmt_exp(exponent(sizes, [r['memory'] for r in group]))))
+    return table + "\n\n" + utils.tabulate(rows, 3)
+
+
+def main(args) -> int:
+    wanted = runner.parse_days(args.days) if args.days else None
+    days = [day for day in runner.discover_days(wanted)
+            if day in generators.GENERATORS]
+    parts = runner.parse_days(args.parts) if args.parts else runner.PARTS
+    sizes = [int(s) for s in args.sizes.split(',')] if args.sizes else None
+
+    records = run(days, parts, sizes, args.jobs, args.seed)
+    print(format_table(records))
+
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump(records, fd, indent=2)
+            fd.write('\n')
+        print(f"\nResults saved to {args.output}")
+
+    return 1 if any(r['error'] for r in records) else 0
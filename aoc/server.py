@@ -0,0 +1,321 @@
+# # #
+# Warm solver daemon: answer queries over a Unix domain socket
+#
+# Starting the interpreter, importing a day module (and whatever it reads at
+# import time) and reading the input often take longer than solving. The
+# server does this once and then answers queries from a long-running process:
+#
+#   python -m aoc serve --days 1-21 &
+#   python -m aoc query 15 2
+#   python -m aoc query 15 2 inputs/big.txt
+#   cat other.txt | python -m aoc query 1 1 -
+#   python -m aoc query --stats
+#   python -m aoc query --stop
+#
+# The server keeps:
+#   - day modules imported. A module is reloaded when its solution.py
+#     changes; changes in other modules it imports need a restart;
+#   - lines of input files, up to MAX_INPUTS of them (least recently used are
+#     dropped), reread when the file changes (size or modification time);
+#   - arguments prepared from these lines for solve_p1/solve_p2 (see
+#     runner.prepare_args()), by day, part and input, up to MAX_INPUTS of
+#     them. They are pickled and every query gets a fresh copy, so that
+#     solutions can modify them. They are dropped when the input changes or
+#     the module of the day is reloaded;
+#   - the in-memory part of the cache of parsed inputs (see cache.parsed()),
+#     which days 04 and 13 use.
+#
+# The protocol is JSON lines: the client sends one object per line and gets
+# one object per line back, in the same order. A connection can carry any
+# number of requests:
+#
+#   {"op": "solve", "day": 15, "part": 2, "input": "/abs/path.txt"}
+#   {"op": "solve", "day": 1, "part": 1, "text": "199\n200\n..."}
+#   {"op": "stats"}
+#   {"op": "stop"}
+#
+# Without "input" and "text", the real input of the day is used. Paths must
+# be absolute, the client makes them so. Solve requests get back a record
+# like that of the runner, with the answer, the error and timings (seconds).
+#
+# Requests are handled one at a time: solutions print (to a captured stdout)
+# and keep state at module level, so they can not share a process with other
+# solutions running at the same time.
+#
+# The socket is AOC_SOCKET or aoc-<uid>.sock in the temporary directory and
+# only the owner can connect to it.
+#
+
+import io
+import os
+import sys
+import json
+import time
+import pickle
+import socket
+import tempfile
+import importlib
+import contextlib
+import socketserver
+from collections import OrderedDict
+from typing import List, Optional
+
+from aoc import utils
+from aoc import runner
+
+MAX_INPUTS = 64
+
+
+def socket_path() -> str:
+    return os.environ.get('AOC_SOCKET') or os.path.join(
+        tempfile.gettempdir(), f"aoc-{os.getuid()}.sock")
+
+
+class Solver(object):
+    """Solves parts of days, keeping the modules and the inputs in memory"""
+
+    def __init__(self, max_inputs: int = MAX_INPUTS):
+        self.max_inputs = max_inputs
+        self.sources = {}  # day --> modification time of its solution.py
+        self.inputs = OrderedDict()  # path --> ((mtime, size), lines)
+        # (day, part, path) --> pickled arguments of solve_pN
+        self.prepared = OrderedDict()
+        self.requests = 0
+        self.started = time.time()
+
+    def module(self, day: int):
+        """Import the module of the day, reload it if its source changed"""
+        module = runner.import_day(day)
+        mtime = os.stat(module.__file__).st_mtime_ns
+        if self.sources.setdefault(day, mtime) != mtime:
+            module = importlib.reload(module)
+            self.sources[day] = mtime
+            self.forget(lambda key: key[0] == day)
+        return module
+
+    def forget(self, match):
+        """Drop prepared arguments whose keys match"""
+        for key in [key for key in self.prepared if match(key)]:
+            del self.prepared[key]
+
+    def lines(self, fname: str) -> List[str]:
+        """Lines of the file, read only if not known or changed"""
+        st = os.stat(fname)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self.inputs.get(fname)
+        if entry is None or entry[0] != stamp:
+            self.forget(lambda key: key[2] == fname)
+            entry = self.inputs[fname] = (stamp, utils.load_input(fname))
+            while len(self.inputs) > self.max_inputs:
+                self.inputs.popitem(last=False)
+        self.inputs.move_to_end(fname)
+        return entry[1]
+
+    def arguments(self, module, day: int, part: int, fname: str) -> tuple:
+        """Arguments of solve_pN for the input in the file, prepared only if
+        not known or the input changed"""
+        lines = self.lines(fname)
+        key = (day, part, fname)
+        data = self.prepared.get(key)
+        if data is not None:
+            self.prepared.move_to_end(key)
+            return pickle.loads(data)
+        # solutions may modify their input, keep ours intact
+        args = runner.prepare_args(module, list(lines), part)
+        try:
+            self.prepared[key] = pickle.dumps(args, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # not picklable, prepare again next time
+            return args
+        while len(self.prepared) > self.max_inputs:
+            self.prepared.popitem(last=False)
+        return args
+
+    def warm_up(self, days: List[int]):
+        """Import modules and read real inputs of given days"""
+        for day in days:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.module(day)
+            if os.path.exists(runner.input_file(day)):
+                self.lines(runner.input_file(day))
+
+    def solve(self, day: int, part: int, fname: Optional[str] = None,
+              text: Optional[str] = None) -> dict:
+        self.requests += 1
+        res = {'day': day, 'part': part, 'input': fname, 'answer': None,
+               'error': None, 'parse': None, 'solve': None}
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                start = time.perf_counter()
+                module = self.module(day)
+                res['import'] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                if text is not None:
+                    lines = [line.rstrip('\r\n')
+                             for line in io.StringIO(text)]
+                    args = runner.prepare_args(module, lines, part)
+                else:
+                    args = self.arguments(module, day, part,
+                                          fname or runner.input_file(day))
+                res['parse'] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                answer = getattr(module, f"solve_p{part}")(*args)
+                res['solve'] = time.perf_counter() - start
+                res['answer'] = str(answer)
+            except Exception as ex:
+                res['error'] = "{}: {}".format(type(ex).__name__, ex)
+        return res
+
+    def stats(self) -> dict:
+        return {'pid': os.getpid(), 'uptime': time.time() - self.started,
+                'requests': self.requests, 'days': sorted(self.sources),
+                'inputs': list(self.inputs),
+                'prepared': ["day {:02d} p.{} {}".format(*key)
+                             for key in self.prepared]}
+
+
+class Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = self.server.dispatch(json.loads(line))
+            except Exception as ex:
+                reply = {'error': "{}: {}".format(type(ex).__name__, ex)}
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+            self.wfile.flush()
+            if self.server.stopping:
+                break
+
+
+class Server(socketserver.UnixStreamServer):
+
+    def __init__(self, path: str, solver: Solver):
+        self.solver = solver
+        self.stopping = False
+        super().__init__(path, Handler)
+
+    def server_bind(self):
+        # nobody but the owner may connect, even for a moment
+        old_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def dispatch(self, request: dict) -> dict:
+        op = request.get('op', 'solve')
+        if op == 'solve':
+            return self.solver.solve(int(request['day']),
+                                     int(request['part']),
+                                     request.get('input'),
+                                     request.get('text'))
+        if op == 'stats':
+            return self.solver.stats()
+        if op == 'stop':
+            self.stopping = True
+            return {'stopped': True}
+        raise ValueError(f"unknown operation: {op}")
+
+    def serve_until_stopped(self):
+        while not self.stopping:
+            self.handle_request()
+
+
+def is_running(path: str) -> bool:
+    """Check if a server listens on the socket"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+            return True
+        except OSError:
+            return False
+
+
+def serve(path: str, days: List[int] = ()) -> int:
+    if os.path.exists(path):
+        if is_running(path):
+            print(f"Server already running at {path}", file=sys.stderr)
+            return 1
+        # left behind by a server that was killed
+        os.unlink(path)
+
+    solver = Solver()
+    start = time.perf_counter()
+    solver.warm_up(days)
+    print("Warmed up {} days in {:.2f} s, listening at {}".format(
+        len(days), time.perf_counter() - start, path), flush=True)
+    try:
+        with Server(path, solver) as server:
+            server.serve_until_stopped()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+    print(f"Stopped after {solver.requests} requests")
+    return 0
+
+
+def query(requests: List[dict], path: Optional[str] = None) -> List[dict]:
+    """Send requests to the server over one connection and return replies"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path or socket_path())
+        sock.sendall(b''.join(json.dumps(request).encode() + b'\n'
+                              for request in requests))
+        with sock.makefile('rb') as fd:
+            return [json.loads(fd.readline()) for _ in requests]
+
+
+def serve_main(args) -> int:
+    days = runner.discover_days(runner.parse_days(args.days)) \
+        if args.days else []
+    return serve(args.socket or socket_path(), days)
+
+
+def query_main(args) -> int:
+    path = args.socket or socket_path()
+    if args.stats or args.stop:
+        requests = [{'op': 'stats' if args.stats else 'stop'}]
+    elif args.day is None:
+        print("Day is required", file=sys.stderr)
+        return 2
+    else:
+        parts = [args.part] if args.part else runner.PARTS
+        request = {'op': 'solve', 'day': args.day}
+        if args.input == '-':
+            request['text'] = sys.stdin.read()
+        elif args.input:
+            request['input'] = os.path.abspath(args.input)
+        requests = [dict(request, part=part) for part in parts]
+
+    start = time.perf_counter()
+    try:
+        replies = query(requests, path)
+    except OSError as ex:
+        print(f"Can not connect to the server at {path}: {ex}",
+              file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    if args.json or args.stats or args.stop:
+        for reply in replies:
+            print(json.dumps(reply))
+        return 0
+
+    failed = 0
+    for r in replies:
+        if r['error']:
+            failed += 1
+            print(f"Day {r['day']:02d} p.{r['part']}: {r['error']}")
+        elif args.verbose:
+            print("Day {:02d} p.{}: {} (parse {:.2f} ms, solve {:.2f} ms)"
+                  .format(r['day'], r['part'], r['answer'],
+                          1000 * r['parse'], 1000 * r['solve']))
+        else:
+            print(r['answer'])
+    if args.verbose:
+        print("Round trip: {:.2f} ms".format(1000 * elapsed))
+    return 1 if failed else 0
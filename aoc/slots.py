@@ -0,0 +1,182 @@
+# # #
+# Memory and time of slotted model classes against dict-backed twins
+#
+# Classes whose instances are created in large numbers (a Pixel per cell of
+# the image, a Probe per initial velocity, RN and SN per snailfish number,
+# ...) declare __slots__. This benchmark shows what it buys: for every such
+# class it creates <count> instances, once of the class itself and once of
+# its dict-backed twin, and measures
+#
+#   - memory per instance (tracemalloc, the instances are kept alive);
+#   - time to create the instances;
+#   - time to use them: a typical method or attribute access, once each.
+#
+#   python -m aoc slots --count 1000000
+#
+# The twin is a subclass that shadows every slot with a class attribute, so
+# its instances keep these attributes in __dict__ and run the same methods.
+# The twin still has the (empty) slots, so its instances are 8 bytes per slot
+# larger than those of a truly dict-backed class; the saving is understated.
+#
+# Every measurement runs in a fresh process.
+#
+
+import gc
+import io
+import json
+import time
+import tracemalloc
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Callable, Tuple
+
+from aoc import utils
+from aoc import runner
+
+VARIANTS = ('slots', 'dict')
+
+
+def slot_names(cls) -> List[str]:
+    """Names of all slots of the class and its bases"""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return names
+
+
+def dict_backed(cls):
+    """Make a subclass of <cls> whose instances keep attributes in
+    __dict__ instead of slots"""
+    namespace = {name: None for name in slot_names(cls)}
+    namespace['__module__'] = cls.__module__
+    return type(cls.__name__, (cls,), namespace)
+
+
+def _specimens() -> List[Tuple[str, type, Callable, Callable]]:
+    """Classes to measure as (name, class, make(cls), use(obj)). Arguments
+    that do not depend on the class are shared by all instances, so that
+    only the instances are measured."""
+    d04 = runner.import_day(4)
+    d12 = runner.import_day(12)
+    d17 = runner.import_day(17)
+    d18 = runner.import_day(18)
+    d20 = runner.import_day(20)
+    d21 = runner.import_day(21)
+    nodes = ['start', 'A', 'b', 'A', 'c']
+    rows = [[5 * i + j for j in range(5)] for i in range(5)]
+    return [
+        ('day 04 BingoBoard', d04.BingoBoard,
+         lambda cls: cls(rows), lambda b: b.width),
+        ('day 04 BingoBoard2', d04.BingoBoard2,
+         lambda cls: cls(rows), lambda b: b.wins()),
+        ('day 12 GPath', d12.GPath,
+         lambda cls: cls(nodes), lambda p: p.is_full()),
+        ('day 12 GPath2', d12.GPath2,
+         lambda cls: cls(nodes), lambda p: p.is_full()),
+        ('day 17 Probe', d17.Probe,
+         lambda cls: cls(6, 9), lambda p: p.move()),
+        ('day 18 RN', d18.RN,
+         lambda cls: cls(7), lambda n: n.magnitude),
+        ('day 18 SN', d18.SN,
+         lambda cls: cls(), lambda n: n.left),
+        ('day 20 Pixel', d20.Pixel,
+         lambda cls: cls('#'), lambda p: int(p)),
+        ('day 20 InfinityPixel', d20.InfinityPixel,
+         lambda cls: cls('#', None), lambda p: int(p)),
+        ('day 21 DeterministicDie', d21.DeterministicDie,
+         lambda cls: cls(), lambda d: next(d)),
+    ]
+
+
+def names() -> List[str]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [name for name, *_ in _specimens()]
+
+
+def measure(name: str, variant: str, count: int) -> dict:
+    """Create <count> instances of the named class (or its dict-backed twin)
+    and measure memory and time"""
+    res = {'class': name, 'variant': variant, 'count': count,
+           'bytes': None, 'create': None, 'use': None, 'error': None}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            specimens = {spec[0]: spec for spec in _specimens()}
+        _, cls, make, use = specimens[name]
+        if variant == 'dict':
+            cls = dict_backed(cls)
+
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            objects = [make(cls) for _ in range(count)]
+            res['create'] = time.perf_counter() - start
+            start = time.perf_counter()
+            for obj in objects:
+                use(obj)
+            res['use'] = time.perf_counter() - start
+            del objects
+
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            objects = [make(cls) for _ in range(count)]
+            # the list itself is not part of the instances
+            res['bytes'] = (tracemalloc.get_traced_memory()[0] - before
+                            - objects.__sizeof__()) / count
+            tracemalloc.stop()
+            del objects
+        finally:
+            gc.enable()
+    except Exception as ex:
+        res['error'] = "{}: {}".format(type(ex).__name__, ex)
+    return res
+
+
+def run(count: int, jobs: int = 1) -> List[dict]:
+    """Measure every class, both variants, each in a fresh process"""
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(measure, name, variant, count)
+                   for name in names() for variant in VARIANTS]
+        return [future.result() for future in futures]
+
+
+def _ms(seconds) -> str:
+    return '-' if seconds is None else "{:.1f}".format(seconds * 1000)
+
+
+def _ratio(new, old) -> str:
+    return '-' if not new or not old else "{:+.0%}".format(new / old - 1)
+
+
+def format_table(records: List[dict]) -> str:
+    by_class = {}
+    for r in records:
+        by_class.setdefault(r['class'], {})[r['variant']] = r
+    rows = [("Class", "Slots, B", "Dict, B", "Memory",
+             "Create, ms", "Dict, ms", "Use, ms", "Dict, ms", "Time")]
+    for name, pair in by_class.items():
+        s, d = pair['slots'], pair['dict']
+        error = s['error'] or d['error']
+        if error:
+            rows.append((name, error) + ('',) * 7)
+            continue
+        rows.append((name, "{:.0f}".format(s['bytes']),
+                     "{:.0f}".format(d['bytes']),
+                     _ratio(s['bytes'], d['bytes']),
+                     _ms(s['create']), _ms(d['create']),
+                     _ms(s['use']), _ms(d['use']),
+                     _ratio(s['create'] + s['use'], d['create'] + d['use'])))
+    return utils.tabulate(rows, 1)
+
+
+def main(args) -> int:
+    records = run(args.count, args.jobs)
+    print(f"Instances per class: {args.count}")
+    print(format_table(records))
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump(records, fd, indent=2)
+            fd.write('\n')
+        print(f"\nResults saved to {args.output}")
+    return 1 if any(r['error'] for r in records) else 0
@@ -0,0 +1,150 @@
+# # #
+# Hierarchical timing of code regions (spans)
+#
+# A span measures a region of code and can contain other spans. Time spent in
+# a span is aggregated per path of nested span names (e.g. solve/run_simulations)
+# with the number of calls, total time and self time (total minus time of the
+# nested spans).
+#
+#   from aoc import spans
+#
+#   with spans.span('parse'):
+#       ...
+#
+#   @spans.timed
+#   def run_simulations(...):
+#       ...
+#
+#   print(spans.report())
+#
+# Spans are disabled unless the environment variable AOC_SPANS is set to 1
+# or spans.enable() is called. A disabled span does nothing but a function
+# call and a check of a flag.
+#
+
+import os
+import functools
+from time import perf_counter_ns
+from typing import Dict, Tuple, List, Optional
+
+from aoc import utils
+
+_enabled = bool(int(os.environ.get('AOC_SPANS', 0)))
+
+# currently open spans, innermost last
+_stack: List['Span'] = []
+
+# path of span names --> [calls, total time, time of nested spans], in ns
+_stats: Dict[Tuple[str, ...], List[int]] = {}
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Forget all collected statistics"""
+    _stats.clear()
+
+
+class Span(object):
+
+    __slots__ = ('name', 'key', 'start', 'child')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.key = (_stack[-1].key if _stack else ()) + (self.name,)
+        self.child = 0
+        _stack.append(self)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = perf_counter_ns() - self.start
+        _stack.pop()
+        if _stack:
+            _stack[-1].child += elapsed
+        st = _stats.get(self.key)
+        if st is None:
+            st = _stats[self.key] = [0, 0, 0]
+        st[0] += 1
+        st[1] += elapsed
+        st[2] += self.child
+
+
+class NullSpan(object):
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = NullSpan()
+
+
+def span(name: str):
+    """Context manager that measures the enclosed code"""
+    return Span(name) if _enabled else _NULL_SPAN
+
+
+def timed(func=None, name: Optional[str] = None):
+    """Decorator that measures every call of the function as a span.
+    By default, the span is named after the function.
+    Can be used both as @timed and @timed(name='something').
+    """
+    if func is None:
+        return functools.partial(timed, name=name)
+
+    name = name or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        with Span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def stats() -> List[dict]:
+    """Return collected statistics as a list of records in depth-first order
+    of span paths. Times are in nanoseconds."""
+    records = []
+    for key in sorted(_stats):
+        calls, total, child = _stats[key]
+        records.append({
+            'path': "/".join(key),
+            'name': key[-1],
+            'depth': len(key) - 1,
+            'calls': calls,
+            'total': total,
+            'self': total - child,
+        })
+    return records
+
+
+def report(records: Optional[List[dict]] = None) -> str:
+    """Make a text table of given (or collected) statistics"""
+    if records is None:
+        records = stats()
+    if not records:
+        return "No spans recorded"
+    rows = [("Span", "Calls", "Total, ms", "Self, ms", "Per call, us")]
+    for r in records:
+        rows.append(("  " * r['depth'] + r['name'],
+                     str(r['calls']),
+                     "{:.2f}".format(r['total'] / 1e6),
+                     "{:.2f}".format(r['self'] / 1e6),
+                     "{:.2f}".format(r['total'] / r['calls'] / 1e3)))
+    return utils.tabulate(rows, 1)
@@ -1,16 +1,164 @@
+import os
+import mmap
+from collections.abc import Sequence
+# monotonic clock with nanosecond resolution
+from time import perf_counter_ns as time_ns
+from typing import List, Union, Tuple, Optional, Iterator, Iterable
 
-from typing import List, Union, Tuple, Optional
+# numpy is needed only by the vectorized parsers, it is imported by the
+# first of them that is called (see _require_numpy()), so that the modules
+# that do not parse with numpy do not pay for importing it
+np = None
 
 
-def load_input(fname: Optional[str] = None) -> List[str]:
-    """Load file, either given or default 'input.txt' and return its content
-    as a list of lines. All lines are returned, including empty ones."""
+def input_path(fname: Optional[str] = None,
+               anchor: Optional[str] = None) -> str:
+    """Return path to the file, either given or default 'input.txt'.
+    A relative path is resolved against the directory of the file <anchor>
+    (usually __file__ of the calling module) or, if <anchor> is not given,
+    against the current directory."""
     fname = fname or 'input.txt'
-    lines = []
-    with open(fname) as fd:
+    if anchor:
+        fname = os.path.join(os.path.dirname(os.path.abspath(anchor)), fname)
+    return fname
+
+
+def load_input(fname: Optional[str] = None,
+               anchor: Optional[str] = None) -> List[str]:
+    """Load file, either given or default 'input.txt' and return its content
+    as a list of lines. All lines are returned, including empty ones.
+    See input_path() for the meaning of <anchor>."""
+    return list(iter_input(fname, anchor))
+
+
+def iter_input(fname: Optional[str] = None,
+               anchor: Optional[str] = None) -> Iterator[str]:
+    """Same as load_input() but generate lines one by one, without holding
+    the whole file in memory."""
+    with open(input_path(fname, anchor)) as fd:
         for line in fd:
-            lines.append(line.rstrip('\r\n'))
-    return lines
+            yield line.rstrip('\r\n')
+
+
+class LazyInput(Sequence):
+    """List of lines of a file that is read only when the lines are accessed
+    for the first time. Use it for test inputs defined at module level, so
+    that importing the module does not read files.
+
+    The object is a read-only sequence: indexing, slicing, len() and
+    iteration go to the list of lines. Slices and concatenations are plain
+    lists; copy with list() to modify the lines."""
+
+    def __init__(self, fname: str, anchor: Optional[str] = None):
+        self.fname = input_path(fname, anchor)
+        self._data = None
+
+    @property
+    def data(self) -> List[str]:
+        if self._data is None:
+            self._data = load_input(self.fname)
+        return self._data
+
+    def __getitem__(self, i):
+        return self.data[i]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyInput):
+            other = other.data
+        return self.data == other
+
+    def __add__(self, other) -> List[str]:
+        return self.data + list(other)
+
+    def __radd__(self, other) -> List[str]:
+        return list(other) + self.data
+
+    def __mul__(self, n: int) -> List[str]:
+        return self.data * n
+
+    __rmul__ = __mul__
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(type(self).__name__, self.fname)
+
+
+def lazy_input(fname: str, anchor: Optional[str] = None) -> LazyInput:
+    """Same as load_input() but read the file on first access to the lines"""
+    return LazyInput(fname, anchor)
+
+
+class MappedInput(object):
+    """Content of a file mapped into memory (read only).
+
+    The content is available as bytes-like object in .data. Iterating over
+    the object generates lines as memoryview slices of the mapping, with line
+    endings removed, without copying the lines. A line can be converted with
+    bytes(line) or, if a copy is not wanted, used with functions that accept
+    bytes-like objects, e.g. int(line) does not work but int(bytes(line))
+    and line.tobytes().decode() do.
+
+    The mapping can not be closed while any of the slices is still alive.
+    """
+
+    def __init__(self, fname: str):
+        self.fname = fname
+        self.fd = open(fname, 'rb')
+        if os.fstat(self.fd.fileno()).st_size:
+            self.data = mmap.mmap(self.fd.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # empty files can not be mapped
+            self.data = b''
+
+    def __len__(self):
+        """Size in bytes"""
+        return len(self.data)
+
+    def __iter__(self):
+        return self.lines()
+
+    def lines(self, start: int = 0, end: Optional[int] = None
+              ) -> Iterator[memoryview]:
+        """Generate lines that start in the byte range [start, end).
+        The range is expected to start at the beginning of a line."""
+        data = self.data
+        end = len(data) if end is None else end
+        with memoryview(data) as view:
+            pos = start
+            while pos < end:
+                nl = data.find(b'\n', pos)
+                if nl < 0:
+                    nl = len(data)
+                stop = nl
+                if stop > pos and data[stop-1] == 13:  # \r
+                    stop -= 1
+                yield view[pos:stop]
+                pos = nl + 1
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.fd.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def map_input(fname: Optional[str] = None,
+              anchor: Optional[str] = None) -> MappedInput:
+    """Map file, either given or default 'input.txt', into memory.
+    See input_path() for the meaning of <anchor>. Use as a context manager:
+
+      with utils.map_input() as inp:
+          for line in inp:
+              ...
+    """
+    return MappedInput(input_path(fname, anchor))
 
 
 def group_lines(data: Union[str, List[str]]) -> List[List[str]]:
@@ -31,7 +179,7 @@ def group_lines(data: Union[str, List[str]]) -> List[List[str]]:
     return groups
 
 
-def to_numbers(lines: List[str]) -> List[int]:
+def to_numbers(lines: Iterable[str]) -> List[int]:
     """Convert list of lines (strings) to list of ints"""
     return [int(line) for line in lines]
 
@@ -40,34 +188,214 @@ def minmax(numbers: List[int]) -> Tuple[int, int]:
     """Return min and max values from given list of integers"""
     return (min(numbers), max(numbers))
 
-# Source
-# https://stackoverflow.com/questions/55774054/precise-time-in-nano-seconds-for-python-3-6-and-earlier
 
-import ctypes
+def _require_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy is required for vectorized parsing")
+        np = numpy
+    return np
+
+
+def _bytes_like(data):
+    """Turn given data into a bytes-like object. The data is either a
+    bytes-like object (bytes, mmap, memoryview, array of uint8), a string or
+    a list of lines. Bytes-like objects are returned as is."""
+    _require_numpy()
+    if isinstance(data, str):
+        return data.encode()
+    if isinstance(data, (bytes, bytearray, memoryview, mmap.mmap, np.ndarray)):
+        return data
+    return "\n".join(data).encode()
+
+
+def _as_bytes(data) -> 'np.ndarray':
+    """View given data as a 1D array of bytes (uint8) without copying.
+    See _bytes_like() for what <data> can be."""
+    data = _bytes_like(data)
+    if isinstance(data, np.ndarray):
+        return data.view(np.uint8).reshape(-1)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def digit_grid(data) -> 'np.ndarray':
+    """Parse a grid of digits, one row per line, into a 2D array of uint8.
+    See _bytes_like() for what <data> can be."""
+    buf = _as_bytes(data)
+    # drop trailing line endings, then all rows must be equally long
+    end = len(buf)
+    while end and buf[end-1] in (10, 13):
+        end -= 1
+    buf = buf[:end]
+    if not end:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    newline = np.flatnonzero(buf == 10)
+    width = int(newline[0]) if len(newline) else end
+    stride = width + 1
+    crlf = width > 0 and buf[width-1] == 13
+    # all rows but the last are a view of the buffer, the last one has no
+    # line ending and is copied on its own, not the whole buffer
+    full = len(newline) * stride
+    if full + width - crlf != end:
+        raise ValueError("Rows of the grid have different lengths")
+    rows = buf[:full].reshape(-1, stride)
+    if (rows[:, width] != 10).any() or \
+            (crlf and (rows[:, width-1] != 13).any()):
+        raise ValueError("Rows of the grid have different lengths")
+
+    width -= crlf
+    grid = np.empty((len(rows) + 1, width), dtype=np.uint8)
+    np.subtract(rows[:, :width], 48, out=grid[:-1])
+    np.subtract(buf[full:full+width], 48, out=grid[-1])
+    # characters below '0' wrap around to large values
+    if grid.size and grid.max() > 9:
+        raise ValueError("Grid contains characters other than digits")
+    return grid
 
-CLOCK_REALTIME = 0
 
-class timespec(ctypes.Structure):
-    _fields_ = [
-        ('tv_sec', ctypes.c_int64), # seconds, https://stackoverflow.com/q/471248/1672565
-        ('tv_nsec', ctypes.c_int64), # nanoseconds
-    ]
+# bytes that may separate integers: whitespace and commas
+_SEPARATORS = b' \t\n\r,'
+_SIGNS = b'+-'
+# int_array() parses the buffer in blocks of about this many bytes, so that
+# the temporary arrays of a block stay in the CPU cache
+_BLOCK = 1 << 18
+# longest run of digits that always fits into int64
+_MAX_DIGITS = 18
 
-clock_gettime = ctypes.cdll.LoadLibrary('libc.so.6').clock_gettime
-clock_gettime.argtypes = [ctypes.c_int64, ctypes.POINTER(timespec)]
-clock_gettime.restype = ctypes.c_int64
 
+def _swar_digits(windows: 'np.ndarray', ends: 'np.ndarray',
+                 lengths: 'np.ndarray') -> 'np.ndarray':
+    """Values of the last (at most 8) digits of the runs of <lengths> digits
+    that end at <ends>, in the sliding windows of 8 digit values. The bytes
+    of a window are read as one uint64 and combined pairwise (SWAR): digits
+    into 2-digit numbers, those into 4-digit ones, then into one."""
+    # keep the last <length> bytes, the high ones in little endian
+    keep = np.array([(2**64 - 1) << (64 - 8 * n) & (2**64 - 1)
+                     for n in range(9)], dtype=np.uint64)
+    x = windows[ends].view(np.uint64).reshape(-1)
+    x &= np.take(keep, lengths, mode='clip')
+    tmp = np.empty_like(x)
+    for mul, shift, mask in ((10, 8, 0x00FF00FF00FF00FF),
+                             (100, 16, 0x0000FFFF0000FFFF),
+                             (10000, 32, 0x00000000FFFFFFFF)):
+        np.right_shift(x, np.uint64(shift), out=tmp)
+        x *= np.uint64(mul)
+        x += tmp
+        x &= np.uint64(mask)
+    return x.view(np.int64)
 
-def time_ns():
-    tmp = timespec()
-    ret = clock_gettime(CLOCK_REALTIME, ctypes.pointer(tmp))
-    if bool(ret):
-        raise OSError()
-    return tmp.tv_sec * 10 ** 9 + tmp.tv_nsec
+
+def _int_block(block: 'np.ndarray') -> 'np.ndarray':
+    """Parse the integers in a block of bytes for int_array()"""
+    if not len(block):
+        return np.zeros(0, dtype=np.int64)
+    # digit values, with 8 bytes in front for the windows of the 1st number
+    padded = np.zeros(len(block) + 8, dtype=np.uint8)
+    digits = padded[8:]
+    np.subtract(block, 48, out=digits)
+    is_digit = digits < 10
+    counts = {char: np.count_nonzero(block == char)
+              for char in _SEPARATORS + _SIGNS}
+    if len(block) - np.count_nonzero(is_digit) != sum(counts.values()):
+        raise ValueError("Unexpected characters among the integers")
+
+    bounds = np.flatnonzero(is_digit[1:] != is_digit[:-1]) + 1
+    if is_digit[0] or is_digit[-1]:
+        bounds = np.concatenate(([0] if is_digit[0] else [], bounds,
+                                 [len(block)] if is_digit[-1] else []))
+        bounds = bounds.astype(np.intp)
+    starts, ends = bounds[0::2], bounds[1::2]
+    lengths = ends - starts
+
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 8)
+    values = _swar_digits(windows, ends, lengths)
+    for skip in range(8, min(int(lengths.max(initial=0)), _MAX_DIGITS), 8):
+        longer = np.flatnonzero(lengths > skip)
+        values[longer] += 10 ** skip * _swar_digits(
+            windows, ends[longer] - skip, lengths[longer] - skip)
+
+    negative = np.zeros(0, dtype=np.intp)
+    if counts[ord('-')] or counts[ord('+')]:
+        # a sign must stand right before a number and after a separator
+        signs = np.flatnonzero((block == ord('-')) | (block == ord('+')))
+        before = block[signs[signs > 0] - 1]
+        if signs[-1] + 1 == len(block) or not is_digit[signs + 1].all() or \
+                is_digit[signs[signs > 0] - 1].any() or \
+                ((before == ord('-')) | (before == ord('+'))).any():
+            raise ValueError("Unexpected characters among the integers")
+        minus = signs[block[signs] == ord('-')]
+        negative = np.searchsorted(starts, minus + 1)
+        values[negative] *= -1
+
+    int64 = np.iinfo(np.int64)
+    for idx in np.flatnonzero(lengths > _MAX_DIGITS):
+        # too long for int64 arithmetic: parse with Python ints and clip
+        value = int(bytes(block[starts[idx]:ends[idx]]))
+        value = -value if idx in negative else value
+        values[idx] = max(int64.min, min(value, int64.max))
+    return values
+
+
+def int_array(data) -> 'np.ndarray':
+    """Parse integers separated by commas and/or whitespace (including line
+    endings) into a 1D array of int64. Values that do not fit into int64 are
+    clipped. See _bytes_like() for what <data> can be.
+
+    The buffer is neither copied nor decoded: runs of digits are found with
+    array operations and turned into numbers 8 digits at a time."""
+    buf = _as_bytes(data)
+    parts = []
+    start = 0
+    while start < len(buf):
+        end = min(start + _BLOCK, len(buf))
+        # end blocks on a separator, so that numbers and their signs are not
+        # split between blocks
+        while end < len(buf) and buf[end] not in _SEPARATORS:
+            end += 1
+        parts.append(_int_block(buf[start:end]))
+        start = end
+    if not parts:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(parts)
+
+
+def load_digit_grid(fname: Optional[str] = None,
+                    anchor: Optional[str] = None) -> 'np.ndarray':
+    """Load file, either given or default 'input.txt', as a digit grid.
+    See digit_grid()"""
+    _require_numpy()
+    return digit_grid(np.fromfile(input_path(fname, anchor), dtype=np.uint8))
+
+
+def load_int_array(fname: Optional[str] = None,
+                   anchor: Optional[str] = None) -> 'np.ndarray':
+    """Load file, either given or default 'input.txt', as an array of
+    integers. See int_array()"""
+    _require_numpy()
+    return int_array(np.fromfile(input_path(fname, anchor), dtype=np.uint8))
+
+
+def tabulate(rows: List[tuple], nleft: int = 1) -> str:
+    """Make a text table from rows of strings, the 1st row being the header.
+    The first <nleft> columns are aligned left, the others right."""
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = []
+    for idx, row in enumerate(rows):
+        cells = [cell.ljust(w) if i < nleft else cell.rjust(w)
+                 for i, (cell, w) in enumerate(zip(row, widths))]
+        lines.append("  ".join(cells).rstrip())
+        if idx == 0:
+            lines.append("  ".join("-" * w for w in widths))
+    return "\n".join(lines)
 
 
 def mytimeit(func, n=1):
-    """A decorator to measure runtime of a function in nanoseconds"""
+    """A decorator to measure runtime of a function in nanoseconds.
+    See also aoc.spans for measuring nested regions of code."""
     def wrapper(*args, **kwargs):
         start = time_ns()
         res = func(*args, **kwargs)
@@ -0,0 +1,203 @@
+# # #
+# Alternative implementations of the same part, checked and timed together
+#
+# Some days keep competing implementations side by side. A day module
+# declares them as named variants of a part:
+#
+#   VARIANTS = {2: {'naive': solve_p2_naive, 'memo': solve_p2}}
+#
+# Every variant takes the same arguments as solve_p1/solve_p2. For every
+# part with variants, the suite solves generated inputs (aoc.generators) of
+# several sizes and, if asked, the real input with every variant and
+#
+#   - cross-checks that all variants give the same answer on every input
+#     (and the recorded answer on the real input, if known);
+#   - benchmarks the variants head to head: rounds of runs, every round runs
+#     each variant once, so that all of them see the same state of the
+#     machine. The first <warmup> rounds are not measured.
+#
+#   python -m aoc variants --days 4,6,7,9,20 --sizes 100,200 --repeat 5
+#
+# Real inputs are opt-in (--real): some variants are there because they are
+# slow, e.g. 'sum' of day 07 takes ~30 s per round on the real input.
+#
+# Every input is solved in a fresh process. A variant that fails is
+# reported with its error and does not stop the others.
+#
+
+import io
+import json
+import time
+import statistics
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Callable, Optional
+
+from aoc import utils
+from aoc import runner
+from aoc import generators
+
+REAL = 'real'
+
+
+def variants(module) -> Dict[int, Dict[str, Callable]]:
+    """Variants declared by the module of a day, by part"""
+    return getattr(module, 'VARIANTS', {})
+
+
+def find_days(days: Optional[List[int]] = None) -> List[int]:
+    """Days (of given ones) that declare variants"""
+    found = []
+    for day in runner.discover_days(days):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if variants(runner.import_day(day)):
+                found.append(day)
+    return found
+
+
+def default_sizes(day: int) -> List[int]:
+    """The two smallest default sizes of the generator: implementations that
+    lose are usually slow, larger inputs are for explicit --sizes"""
+    if day not in generators.GENERATORS:
+        return []
+    return generators.GENERATORS[day][2][:2]
+
+
+def measure(day: int, part: int, size: Optional[int] = None,
+            warmup: int = 1, repeat: int = 3, seed: int = 2021) -> dict:
+    """Solve the real input (<size> None) or a generated one with every
+    variant of the part, <warmup> + <repeat> times"""
+    res = {'day': day, 'part': part, 'input': size or REAL, 'error': None,
+           'variants': {}}
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            module = runner.import_day(day)
+            if size is None:
+                lines = utils.load_input(runner.input_file(day))
+            else:
+                lines = generators.generate(day, size, seed)
+        except Exception as ex:
+            res['error'] = "{}: {}".format(type(ex).__name__, ex)
+            return res
+
+        candidates = variants(module).get(part, {})
+        for name in candidates:
+            res['variants'][name] = {'answer': None, 'error': None,
+                                     'times': []}
+        for rnd in range(warmup + repeat):
+            for name, solve in candidates.items():
+                r = res['variants'][name]
+                if r['error']:
+                    continue
+                try:
+                    # some solutions modify their input, give each run a copy
+                    args = runner.prepare_args(module, list(lines), part)
+                    start = time.perf_counter()
+                    answer = str(solve(*args))
+                    elapsed = time.perf_counter() - start
+                except Exception as ex:
+                    r['error'] = "{}: {}".format(type(ex).__name__, ex)
+                    continue
+                if r['answer'] is not None and answer != r['answer']:
+                    r['error'] = "answer changed between runs: {} -> {}" \
+                        .format(r['answer'], answer)
+                r['answer'] = answer
+                if rnd >= warmup:
+                    r['times'].append(elapsed)
+    return res
+
+
+def check(record: dict, expected: Optional[str] = None) -> str:
+    """Status of the input: ok if all variants agree (with each other and
+    with the expected answer, if given), MISMATCH or ERROR otherwise"""
+    if record['error']:
+        return 'ERROR'
+    results = record['variants'].values()
+    answers = {r['answer'] for r in results if not r['error']}
+    if expected is not None:
+        answers.add(expected)
+    if len(answers) > 1:
+        return 'MISMATCH'
+    if any(r['error'] for r in results):
+        return 'ERROR'
+    return 'ok'
+
+
+def run(days: List[int], parts=runner.PARTS, sizes: Optional[List[int]] = None,
+        real: bool = False, warmup: int = 1, repeat: int = 3, jobs: int = 1,
+        seed: int = 2021) -> List[dict]:
+    """Measure all variants of given days and parts on all inputs, each
+    input in a fresh process. Records get the key 'status' (see check())."""
+    tasks = []
+    for day in days:
+        with contextlib.redirect_stdout(io.StringIO()):
+            declared = variants(runner.import_day(day))
+        day_sizes = []
+        if day in generators.GENERATORS:
+            day_sizes = sizes or default_sizes(day)
+        inputs = ([None] if real else []) + day_sizes
+        for part in parts:
+            if part in declared:
+                tasks.extend((day, part, size) for size in inputs)
+
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(measure, day, part, size, warmup, repeat, seed)
+                   for day, part, size in tasks]
+        records = [future.result() for future in futures]
+
+    answers = {day: runner.load_answers(day) for day in days}
+    for r in records:
+        expected = answers[r['day']][r['part']] if r['input'] == REAL \
+            else None
+        r['status'] = check(r, expected)
+    return records
+
+
+def format_table(records: List[dict]) -> str:
+    rows = [("Day", "Part", "Input", "Variant", "Answer", "Min, ms",
+             "Median, ms", "Relative", "Status")]
+    for r in records:
+        prefix = (f"{r['day']:02d}", str(r['part']), str(r['input']))
+        if r['error']:
+            rows.append(prefix + ('', r['error'], '', '', '', r['status']))
+            continue
+        medians = {name: statistics.median(v['times'])
+                   for name, v in r['variants'].items() if v['times']}
+        fastest = min(medians.values(), default=None)
+        for name, v in r['variants'].items():
+            if v['error']:
+                rows.append(prefix + (name, v['error'][:60], '', '', '',
+                                      r['status']))
+                continue
+            median = medians.get(name)
+            rows.append(prefix + (
+                name, v['answer'][:20],
+                "{:.2f}".format(min(v['times']) * 1000) if v['times'] else '-',
+                "{:.2f}".format(median * 1000) if median is not None else '-',
+                "{:.2f}x".format(median / fastest) if fastest else '-',
+                r['status']))
+    return utils.tabulate(rows, 4)
+
+
+def main(args) -> int:
+    wanted = runner.parse_days(args.days) if args.days else None
+    days = find_days(wanted)
+    parts = runner.parse_days(args.parts) if args.parts else runner.PARTS
+    sizes = [int(s) for s in args.sizes.split(',')] if args.sizes else None
+
+    records = run(days, parts, sizes, args.real, args.warmup,
+                  args.repeat, args.jobs, args.seed)
+    print(format_table(records))
+
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump(records, fd, indent=2)
+            fd.write('\n')
+        print(f"\nResults saved to {args.output}")
+
+    bad = [r for r in records if r['status'] != 'ok']
+    if bad:
+        print("\nVariants disagree or fail: {}".format(", ".join(
+            "day {:02d} p.{} on {}".format(r['day'], r['part'], r['input'])
+            for r in bad)))
+    return 1 if bad else 0
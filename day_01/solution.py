@@ -6,28 +6,172 @@
 
 import os
 import sys
-from typing import List
+import operator
+import functools
+from typing import List, Tuple
+from collections import deque
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import incremental
+from aoc import parallel
 
 
 DAY = '01'
 DEBUG = False
 
 
-def solve_p1(lines: List[str]) -> int:
-    """Solution to the 1st part of the challenge"""
+def solve_p1_zip(lines: List[str]) -> int:
+    """Solution to the 1st part of the challenge, without numpy"""
     nums = utils.to_numbers(lines)
     res = list(filter(lambda x: x[0] < x[1], zip(nums, nums[1:])))
     return len(res)
 
 
-def solve_p2(lines: List[str]) -> int:
-    """Solution to the 2nd part of the challenge"""
+def solve_p2_triples(lines: List[str]) -> int:
+    """Solution to the 2nd part of the challenge, without numpy"""
     nums = utils.to_numbers(lines)
     triples = list(map(sum, zip(nums, nums[1:], nums[2:])))
-    return solve_p1(triples)
+    return solve_p1_zip(triples)
+
+
+def as_depths(lines) -> 'np.ndarray':
+    """Readings as an array, from lines of the input (blank lines are
+    skipped) or from numbers, in a sequence or an iterator (for example,
+    utils.iter_input())"""
+    if isinstance(lines, np.ndarray):
+        return lines
+    if not isinstance(lines, Sequence):
+        lines = list(lines)
+    if len(lines) and isinstance(lines[0], str):
+        return utils.int_array(lines)
+    return np.array(lines, dtype=np.int64)
+
+
+def count_increases_array(depths: 'np.ndarray', window: int = 1) -> int:
+    """Count how many times the sum of a sliding window of <window> readings
+    increases, in one vectorized pass. Two consecutive windows share all
+    readings but the first of the older one and the last of the newer one,
+    so the sum increases iff depths[i+window] > depths[i] and no sums are
+    needed."""
+    if len(depths) <= window:
+        return 0
+    return int(np.count_nonzero(depths[window:] > depths[:-window]))
+
+
+def solve_p1(lines: List[str]) -> int:
+    """Solution to the 1st part of the challenge"""
+    if np is None:
+        return solve_p1_zip(lines)
+    return count_increases_array(as_depths(lines), 1)
+
+
+def solve_p2(lines: List[str]) -> int:
+    """Solution to the 2nd part of the challenge"""
+    if np is None:
+        return solve_p2_triples(lines)
+    return count_increases_array(as_depths(lines), 3)
+
+
+VARIANTS = {
+    1: {'zip': solve_p1_zip, 'numpy': solve_p1},
+    2: {'triples': solve_p2_triples, 'numpy': solve_p2},
+}
+
+
+class Sweep(incremental.Solver):
+    """Count how many times the sum of a sliding window increases, for
+    several sizes of the window at once. Two consecutive windows of size k
+    share all readings but the first of the older one and the last of the
+    newer one, so the sum increases iff the new reading is greater than the
+    one k readings before it. Only the last max(<windows>) readings are kept,
+    in a ring buffer, so memory does not depend on the length of the input.
+    """
+
+    def __init__(self, windows: Tuple[int, ...] = (1, 3)):
+        self.windows = windows
+        self.last = deque(maxlen=max(windows))
+        self.counts = [0] * len(windows)
+
+    def feed(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+        num = int(line)
+        last = self.last
+        for idx, window in enumerate(self.windows):
+            if len(last) >= window and num > last[-window]:
+                self.counts[idx] += 1
+        last.append(num)
+
+    def answer(self) -> Tuple[int, ...]:
+        return tuple(self.counts)
+
+
+class Increases(Sweep):
+    """Count increases of the sum of a sliding window of <window> readings"""
+
+    def __init__(self, window: int = 1):
+        super().__init__((window,))
+
+    def answer(self) -> int:
+        return self.counts[0]
+
+
+class WindowIncreases(Increases):
+
+    def __init__(self):
+        super().__init__(3)
+
+
+# 'all' solves both parts with one ring buffer of the last 3 readings
+INCREMENTAL = {1: Increases, 2: WindowIncreases, 'all': Sweep}
+
+
+def chunk_increases(chunk, window: int = 1) -> Tuple[int, tuple, tuple]:
+    """Partial result of a chunk of the input (bytes) for the parallel
+    solutions: the count of increases inside the chunk, the first and the
+    last <window> readings of the chunk. Comparisons that straddle the
+    boundary with the neighbours are left to stitch_increases()."""
+    if np is None:
+        depths = [int(num) for num in bytes(chunk).split()]
+        count = sum(b > a for a, b in zip(depths, depths[window:]))
+    else:
+        depths = utils.int_array(chunk)
+        count = count_increases_array(depths, window)
+    return (count, tuple(map(int, depths[:window])),
+            tuple(map(int, depths[-window:] if window else ())))
+
+
+def stitch_increases(a: Tuple[int, tuple, tuple], b: Tuple[int, tuple, tuple],
+                     window: int = 1) -> Tuple[int, tuple, tuple]:
+    """Combine partial results of two adjacent chunks. A comparison across
+    the boundary pairs a reading among the last <window> ones of <a> with a
+    reading among the first <window> ones of <b>, so the ends of the chunks
+    are all it takes. Either chunk may hold less than <window> readings."""
+    count_a, head_a, tail_a = a
+    count_b, head_b, tail_b = b
+    seam = tail_a + head_b
+    count = count_a + count_b + sum(
+        seam[i + window] > seam[i]
+        for i in range(max(0, len(seam) - window))
+        if i < len(tail_a) <= i + window)
+    return (count, (head_a + head_b)[:window], (tail_a + tail_b)[-window:])
+
+
+PARALLEL = {
+    part: parallel.MapReduce(
+        functools.partial(chunk_increases, window=window),
+        functools.partial(stitch_increases, window=window),
+        operator.itemgetter(0), raw=True)
+    for part, window in ((1, 1), (2, 3))
+}
 
 
 text_1 = """199
@@ -54,14 +198,32 @@ def run_tests():
         if exp1 is not None:
             res1 = solve_p1(inp)
             print(f"T1.{tid}:", res1 == exp1, exp1, res1)
+            res1 = solve_p1(iter(inp))
+            print(f"T1.{tid}.iter:", res1 == exp1, exp1, res1)
+            res1 = solve_p1_zip(inp)
+            print(f"T1.{tid}.zip:", res1 == exp1, exp1, res1)
+            res1 = Increases().feed_lines(inp).answer()
+            print(f"T1.{tid}.inc:", res1 == exp1, exp1, res1)
+            res1 = PARALLEL[1].run_lines(inp, 3)
+            print(f"T1.{tid}.par:", res1 == exp1, exp1, res1)
 
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T2.{tid}:", res2 == exp2, exp2, res2)
+            res2 = solve_p2_triples(inp)
+            print(f"T2.{tid}.triples:", res2 == exp2, exp2, res2)
+            res2 = WindowIncreases().feed_lines(inp).answer()
+            print(f"T2.{tid}.inc:", res2 == exp2, exp2, res2)
+
+        if exp1 is not None and exp2 is not None:
+            res = Sweep().feed_lines(inp).answer()
+            print(f"T.{tid}.sweep:", res == (exp1, exp2), (exp1, exp2), res)
+            res2 = PARALLEL[2].run_lines(inp, 3)
+            print(f"T2.{tid}.par:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 1154
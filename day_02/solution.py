@@ -6,23 +6,29 @@
 
 import os
 import sys
-from typing import List, Tuple
+from typing import List, Tuple, Iterable, Iterator
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import incremental
+from aoc import parallel
 
 
 DAY = '02'
 DEBUG = False
 
 
-def parse_input(lines: List[str]) -> List[Tuple[str, int]]:
-    def parse(line: str):
-        fields = line.strip().split()
-        assert fields[0] in {'forward', 'down', 'up'}, \
-          "Unrecognized instruction: '{}' in '{}'".format(fields[0], line)
-        return (fields[0], int(fields[1]))
-    return list(map(parse, lines))
+def parse_command(line: str) -> Tuple[str, int]:
+    fields = line.strip().split()
+    assert fields[0] in {'forward', 'down', 'up'}, \
+      "Unrecognized instruction: '{}' in '{}'".format(fields[0], line)
+    return (fields[0], int(fields[1]))
+
+
+def parse_input(lines: Iterable[str]) -> Iterator[Tuple[str, int]]:
+    """Parse commands lazily, so that the input can also be an iterator,
+    for example utils.iter_input()"""
+    return map(parse_command, lines)
 
 
 def solve_p1(lines: List[str]) -> int:
@@ -52,6 +58,88 @@ def solve_p2(lines: List[str]) -> int:
     return x*y
 
 
+class Position(incremental.Solver):
+    """Incremental version of solve_p1"""
+
+    def __init__(self):
+        self.x, self.y = 0, 0
+
+    def feed(self, line: str):
+        if not line.strip():
+            return
+        cmd, arg = parse_command(line)
+        if cmd == 'forward':
+            self.x += arg
+        elif cmd == 'down':
+            self.y += arg
+        elif cmd == 'up':
+            self.y -= arg
+
+    def answer(self) -> int:
+        return self.x * self.y
+
+
+class AimedPosition(Position):
+    """Incremental version of solve_p2"""
+
+    def __init__(self):
+        super().__init__()
+        self.aim = 0
+
+    def feed(self, line: str):
+        if not line.strip():
+            return
+        cmd, arg = parse_command(line)
+        if cmd == 'forward':
+            self.x += arg
+            self.y += arg*self.aim
+        elif cmd == 'down':
+            self.aim += arg
+        elif cmd == 'up':
+            self.aim -= arg
+
+
+INCREMENTAL = {1: Position, 2: AimedPosition}
+
+
+def course_sums(lines: List[str]) -> Tuple[int, int]:
+    """Horizontal position and depth a chunk of commands moves by (part 1).
+    Partial result of a chunk of lines for the parallel solution."""
+    pos = Position().feed_lines(lines)
+    return pos.x, pos.y
+
+
+def course_effect(lines: List[str]) -> Tuple[int, int, int]:
+    """How a chunk of commands changes (x, depth, aim) when the submarine
+    starts it with aim 0 (part 2). Partial result of a chunk of lines for the
+    parallel solution.
+
+    With aim a at the start, every forward X of the chunk dives a*X deeper,
+    so the chunk moves by (dx, ddepth + a*dx, daim): an affine map of the
+    state, and such maps compose. See compose_effects()."""
+    pos = AimedPosition().feed_lines(lines)
+    return pos.x, pos.y, pos.aim
+
+
+def compose_effects(a: Tuple[int, int, int],
+                    b: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """Effect of chunk <a> followed by chunk <b>: <b> starts with the aim
+    <a> ends with. The composition is associative and (0, 0, 0) is its
+    identity, so the chunks can be combined in any grouping (but not in any
+    order)."""
+    dx_a, dy_a, da_a = a
+    dx_b, dy_b, da_b = b
+    return dx_a + dx_b, dy_a + dy_b + da_a * dx_b, da_a + da_b
+
+
+PARALLEL = {
+    1: parallel.MapReduce(course_sums, parallel.add_tuples,
+                          finish=lambda xy: xy[0] * xy[1]),
+    2: parallel.MapReduce(course_effect, compose_effects,
+                          finish=lambda xya: xya[0] * xya[1]),
+}
+
+
 text_1 = """forward 5
 down 5
 forward 8
@@ -72,14 +160,23 @@ def run_tests():
         if exp1 is not None:
             res1 = solve_p1(inp)
             print(f"T1.{tid}:", res1 == exp1, exp1, res1)
+            res1 = Position().feed_lines(inp).answer()
+            print(f"T1.{tid}.inc:", res1 == exp1, exp1, res1)
+            res1 = PARALLEL[1].run_lines(inp, 4)
+            print(f"T1.{tid}.par:", res1 == exp1, exp1, res1)
 
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T2.{tid}:", res2 == exp2, exp2, res2)
+            res2 = AimedPosition().feed_lines(inp).answer()
+            print(f"T2.{tid}.inc:", res2 == exp2, exp2, res2)
+            # a chunk per line
+            res2 = PARALLEL[2].run_lines(inp, len(inp))
+            print(f"T2.{tid}.par:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 1762050
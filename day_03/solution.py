@@ -6,11 +6,13 @@
 
 import os
 import sys
-from typing import List
+from typing import List, Tuple
 from collections import Counter
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import incremental
+from aoc import parallel
 
 
 DAY = '03'
@@ -29,9 +31,10 @@ def solve_p1(lines: List[str]) -> int:
     """Solution to the 1st part of the challenge"""
     gamma, epsilon = '', ''
     for bits in count_bits(lines):
-        most, least = bits.most_common(2)  # ties are possible
-        gamma += most[0]
-        epsilon += least[0]
+        # on a tie '1' is the most common bit, as in the 2nd part
+        most = '1' if bits['1'] >= bits['0'] else '0'
+        gamma += most
+        epsilon += '0' if most == '1' else '1'
     return int(gamma, 2) * int(epsilon, 2)
 
 
@@ -61,6 +64,101 @@ def solve_p2(lines: List[str]) -> int:
     return int(ox, 2) * int(co2, 2)
 
 
+class PowerConsumption(incremental.Solver):
+    """Incremental version of solve_p1: counts of ones at every position"""
+
+    def __init__(self):
+        self.total = 0
+        self.ones = []
+
+    def feed(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+        if not self.ones:
+            self.ones = [0] * len(line)
+        self.total += 1
+        for idx, bit in enumerate(line):
+            if bit == '1':
+                self.ones[idx] += 1
+
+    def answer(self) -> int:
+        # on a tie '1' is the most common bit, same as solve_p1()
+        gamma = "".join('1' if 2 * ones >= self.total else '0'
+                        for ones in self.ones)
+        epsilon = "".join('0' if bit == '1' else '1' for bit in gamma)
+        return int(gamma or '0', 2) * int(epsilon or '0', 2)
+
+
+class LifeSupportRating(incremental.Solver):
+    """Incremental version of solve_p2. The numbers are kept in a binary
+    trie whose nodes know how many numbers start with their prefix, so that
+    selecting by the most or least common bit at the next position needs
+    one step down the trie instead of a pass over the numbers."""
+
+    # node of the trie: [count, child for '0', child for '1']
+
+    def __init__(self):
+        self.root = [0, None, None]
+
+    def feed(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+        node = self.root
+        node[0] += 1
+        for bit in line:
+            idx = 1 if bit == '0' else 2
+            if node[idx] is None:
+                node[idx] = [0, None, None]
+            node = node[idx]
+            node[0] += 1
+
+    def select(self, most_common: bool) -> str:
+        bits = []
+        node = self.root
+        while node[1] or node[2]:
+            zeros = node[1][0] if node[1] else 0
+            ones = node[2][0] if node[2] else 0
+            if not zeros or not ones:
+                # one number left or all numbers have the same bit here
+                take_one = ones > 0
+            elif most_common:
+                take_one = ones >= zeros
+            else:
+                take_one = ones < zeros
+            bits.append('1' if take_one else '0')
+            node = node[2] if take_one else node[1]
+        return "".join(bits)
+
+    def answer(self) -> int:
+        if not self.root[0]:
+            return 0
+        return int(self.select(True), 2) * int(self.select(False), 2)
+
+
+INCREMENTAL = {1: PowerConsumption, 2: LifeSupportRating}
+
+
+def bit_counts(lines: List[str]) -> Tuple[int, ...]:
+    """The number of lines and the counts of ones at every position.
+    Partial result of a chunk of lines for the parallel solution."""
+    power = PowerConsumption().feed_lines(lines)
+    return (power.total, *power.ones)
+
+
+def power_consumption(counts: Tuple[int, ...]) -> int:
+    power = PowerConsumption()
+    power.total, *power.ones = counts
+    return power.answer()
+
+
+PARALLEL = {
+    1: parallel.MapReduce(bit_counts, parallel.add_tuples,
+                          finish=power_consumption),
+}
+
+
 text_1 = """00100
 11110
 10110
@@ -77,6 +175,8 @@ text_1 = """00100
 
 tests = [
     (text_1.split('\n'), 22*9, 23*10),
+    # every column but the last one is a tie
+    (["1100", "0110", "1010", "0001"], 14*1, 12*1),
 ]
 
 
@@ -87,14 +187,23 @@ def run_tests():
         if exp1 is not None:
             res1 = solve_p1(inp)
             print(f"T1.{tid}:", res1 == exp1, exp1, res1)
+            res1 = PowerConsumption().feed_lines(inp).answer()
+            print(f"T1.{tid}.inc:", res1 == exp1, exp1, res1)
+            res1 = PARALLEL[1].run_lines(inp, 5)
+            print(f"T1.{tid}.par:", res1 == exp1, exp1, res1)
+            # one line per chunk: tied columns are only known after reduce
+            res1 = PARALLEL[1].run_lines(inp, len(inp))
+            print(f"T1.{tid}.par.lines:", res1 == exp1, exp1, res1)
 
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T2.{tid}:", res2 == exp2, exp2, res2)
+            res2 = LifeSupportRating().feed_lines(inp).answer()
+            print(f"T2.{tid}.inc:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 1082324
@@ -6,22 +6,53 @@
 
 import os
 import sys
+import functools
+import itertools
 from typing import List, Tuple
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import cache
 
 DAY = '04'
 DEBUG = False
 
 
-class BingoBoard(object):
+class Board(object):
+    """Base class of implementations of a bingo board"""
+
+    __slots__ = ('id',)
 
     @classmethod
     def from_lines(cls, rows: List[str]):
         numbers = [utils.to_numbers(row.split()) for row in rows]
         return cls(numbers)
 
+    @classmethod
+    @cache.parsed(version=2)
+    def parse_input(cls, lines: List[str]) -> Tuple[List[int], List['Board']]:
+        """Return the drawn numbers and boards of this class"""
+        numbers, boards = [], []
+        rows = []
+        # a trailing blank line closes the last board
+        for idx, line in enumerate(itertools.chain(lines, [''])):
+            if idx == 0:
+                numbers = utils.to_numbers(line.split(','))
+            elif line:
+                rows.append(line)
+            elif rows:
+                board = cls.from_lines(rows)
+                boards.append(board)
+                rows = []
+        for idx, board in enumerate(boards):
+            board.id = idx + 1
+        return numbers, boards
+
+
+class BingoBoard(Board):
+
+    __slots__ = ('rows', 'width')
+
     def __init__(self, rows):
         self.rows = rows
         self.width = len(rows[0])
@@ -59,7 +90,7 @@ class BingoBoard(object):
         return s * k
 
 
-class BingoBoard2(object):
+class BingoBoard2(Board):
 
     # Approach
     # 1) index by number: cells[number] = (x, y)
@@ -73,10 +104,7 @@ class BingoBoard2(object):
     # 4) computing the score boils down to summing up keys that still remain
     #    in the index.
 
-    @classmethod
-    def from_lines(cls, rows: List[str]):
-        numbers = [utils.to_numbers(row.split()) for row in rows]
-        return cls(numbers)
+    __slots__ = ('width', 'height', 'cells', 'xhits', 'yhits', 'finished')
 
     def __init__(self, rows: List[List[int]]):
         self.width = len(rows[0])
@@ -104,28 +132,9 @@ class BingoBoard2(object):
         return sum(self.cells.keys()) * k
 
 
-def parse_input(lines: List[str]) -> Tuple[List[int], List['BingoBoard']]:
-    lines.append('')
-    numbers, boards = [], []
-    rows = []
-    for idx, line in enumerate(lines):
-        if idx == 0:
-            numbers = utils.to_numbers(line.split(','))
-        elif line:
-            rows.append(line)
-        elif rows:
-            #board = BingoBoard.from_lines(rows)
-            board = BingoBoard2.from_lines(rows)
-            boards.append(board)
-            rows = []
-    for idx, board in enumerate(boards):
-        board.id = idx + 1
-    return numbers, boards
-
-
-def solve_p1(lines: List[str], part=1) -> int:
+def solve_p1(lines: List[str], part=1, board_class=BingoBoard2) -> int:
     """Solution to the 1st and the 2nd parts of the challenge"""
-    draws, boards = parse_input(lines)
+    draws, boards = board_class.parse_input(lines)
     finished_boards = [False] * len(boards)
     score = 0
     for draw in draws:
@@ -143,13 +152,22 @@ def solve_p1(lines: List[str], part=1) -> int:
     return score
 
 
-def solve_p2(lines: List[str]) -> int:
+def solve_p2(lines: List[str], board_class=BingoBoard2) -> int:
     """Solution to the 2nd part of the challenge"""
-    return solve_p1(lines, 2)
+    return solve_p1(lines, 2, board_class)
+
+
+VARIANTS = {
+    part: {
+        'rows': functools.partial(solve, board_class=BingoBoard),
+        'index': solve,
+    }
+    for part, solve in ((1, solve_p1), (2, solve_p2))
+}
 
 
 tests = [
-    (utils.load_input('test.1.txt'), 188 * 24, 148 * 13),
+    (utils.lazy_input('test.1.txt', __file__), 188 * 24, 148 * 13),
 ]
 
 
@@ -160,14 +178,20 @@ def run_tests():
         if exp1 is not None:
             res1 = solve_p1(inp)
             print(f"T1.{tid}:", res1 == exp1, exp1, res1)
+            for name, solve in VARIANTS[1].items():
+                res1 = solve(list(inp))
+                print(f"T1.{tid}.{name}:", res1 == exp1, exp1, res1)
 
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T2.{tid}:", res2 == exp2, exp2, res2)
+            for name, solve in VARIANTS[2].items():
+                res2 = solve(list(inp))
+                print(f"T2.{tid}.{name}:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 29440
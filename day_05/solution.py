@@ -7,11 +7,13 @@
 import re
 import os
 import sys
-from typing import List
+import functools
+from typing import List, Dict
 from collections import defaultdict
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import parallel
 
 DAY = '05'
 DEBUG = False
@@ -55,8 +57,9 @@ def points_between(startp, endp):
         yield((x, y))
 
 
-def solve_p1(lines: List[str], part=1) -> int:
-    """Solution to the 1st part of the challenge"""
+def rasterize(lines: List[str], part=1) -> Dict[tuple, int]:
+    """Count how many segments cover every point. Part 1 takes only vertical
+    and horizontal segments into account."""
     segments = parse_input(lines)
 
     points = defaultdict(int)
@@ -68,9 +71,23 @@ def solve_p1(lines: List[str], part=1) -> int:
         for pt in points_between(pt1, pt2):
             points[pt] += 1
 
-    res = len([1 for pt, cnt in points.items() if cnt > 1])
+    return points
+
 
-    return res
+def merge_points(points: Dict[tuple, int], other: Dict[tuple, int]):
+    """Add counts of points of <other> to <points>"""
+    for pt, cnt in other.items():
+        points[pt] += cnt
+    return points
+
+
+def count_overlaps(points: Dict[tuple, int]) -> int:
+    return len([1 for pt, cnt in points.items() if cnt > 1])
+
+
+def solve_p1(lines: List[str], part=1) -> int:
+    """Solution to the 1st part of the challenge"""
+    return count_overlaps(rasterize(lines, part))
 
 
 def solve_p2(lines: List[str]) -> int:
@@ -78,6 +95,13 @@ def solve_p2(lines: List[str]) -> int:
     return solve_p1(lines, 2)
 
 
+PARALLEL = {
+    1: parallel.MapReduce(rasterize, merge_points, count_overlaps),
+    2: parallel.MapReduce(functools.partial(rasterize, part=2),
+                          merge_points, count_overlaps),
+}
+
+
 text_1 = """0,9 -> 5,9
 8,0 -> 0,8
 9,4 -> 3,4
@@ -103,14 +127,18 @@ def run_tests():
         if exp1 is not None:
             res1 = solve_p1(inp)
             print(f"T1.{tid}:", res1 == exp1, exp1, res1)
+            res1 = PARALLEL[1].run_lines(inp, 3)
+            print(f"T1.{tid}.par:", res1 == exp1, exp1, res1)
 
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T2.{tid}:", res2 == exp2, exp2, res2)
+            res2 = PARALLEL[2].run_lines(inp, 3)
+            print(f"T2.{tid}.par:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 7380
@@ -70,6 +70,19 @@ def solve_p2(lines: List[str], days: int = 256) -> int:
     return sum(school)
 
 
+def solve_p1_buckets(lines: List[str], days: int = 80) -> int:
+    """Solution to the 1st part with the datastructure of the 2nd"""
+    return solve_p2(lines, days)
+
+
+VARIANTS = {
+    1: {
+        'naive': solve_p1,
+        'buckets': solve_p1_buckets,
+    },
+}
+
+
 # TODO: solve mathematically? how many fish will a single with with initial counter
 # 1 produce in N days?
 #solve_p3()
@@ -92,6 +105,9 @@ def run_tests():
         if exp1 is not None:
             res1 = solve_p1(inp, exp1[0])
             print(f"T1.{tid}:", res1 == exp1[1], exp1[1], res1)
+            for name, solve in VARIANTS[1].items():
+                res1 = solve(inp, exp1[0])
+                print(f"T1.{tid}.{name}:", res1 == exp1[1], exp1[1], res1)
 
         if exp2 is not None:
             res2 = solve_p2(inp, exp2[0])
@@ -99,7 +115,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 379114
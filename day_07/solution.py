@@ -7,6 +7,7 @@
 import re
 import os
 import sys
+import functools
 from typing import List
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -25,43 +26,64 @@ def solve_p1(line: str) -> int:
     return min(total_fuels)
 
 
-def solve_p2(line: str) -> int:
-    """Solution to the 2nd part of the challenge"""
+#   | time -p |
+# 1 | 17,01   |
+# 2 |  0,50   | with memoization
+# 3 |  0,48   | with more complex memoization
+#
+# The memo is made anew for every input, the functions that do not use it
+# take it anyway to have the same signature.
+
+def compute_fuel_1(sp, ep, memo):
+    d = abs(sp - ep)
+    return sum(range(1, 1+d))
 
-    #   | time -p |
-    # 1 | 17,01   |
-    # 2 |  0,50   | with memoization
-    # 3 |  0,48   | with more complex memoization
 
-    def compute_fuel_1(sp, ep):
-        d = abs(sp - ep)
-        return sum(range(1, 1+d))
+def compute_fuel_2(sp, ep, memo):
+    d = abs(sp - ep)
+    if d not in memo:
+        memo[d] = sum(range(1, 1+d))
+    return memo[d]
 
-    def compute_fuel_2(sp, ep, memo={}):
-        d = abs(sp - ep)
-        if d not in memo:
+
+def compute_fuel_3(sp, ep, memo):
+    d = abs(sp - ep)
+    if d not in memo:
+        _d = d - 1
+        if _d in memo:  # 638 times
+            memo[d] = memo[_d] + d
+        else:           # 1353 times
             memo[d] = sum(range(1, 1+d))
-        return memo[d]
-
-    def compute_fuel_3(sp, ep, memo={}):
-        d = abs(sp - ep)
-        if d not in memo:
-            _d = d - 1
-            if _d in memo:  # 638 times
-                memo[d] = memo[_d] + d
-            else:           # 1353 times
-                memo[d] = sum(range(1, 1+d))
-        return memo[d]
+    return memo[d]
+
 
+def solve_p2(line: str, compute_fuel=compute_fuel_3) -> int:
+    """Solution to the 2nd part of the challenge"""
     positions = sorted(list(map(int, line.split(','))))
     mn, mx = utils.minmax(positions)
+    memo = {}
     total_fuels = []
     for alpos in range(mn, 1+mx):
-        total_fuels.append(sum(compute_fuel_3(alpos, pos) for pos in positions))
+        total_fuels.append(
+            sum(compute_fuel(alpos, pos, memo) for pos in positions))
 
     return min(total_fuels)
 
 
+VARIANTS = {
+    2: {
+        'sum': functools.partial(solve_p2, compute_fuel=compute_fuel_1),
+        'memo': functools.partial(solve_p2, compute_fuel=compute_fuel_2),
+        'memo-incremental': solve_p2,
+    },
+}
+
+
+def prepare_input(lines: List[str], part: int) -> tuple:
+    """The solutions take the only line of the input"""
+    return (lines[0],)
+
+
 text_1 = "16,1,2,0,4,2,7,1,2,14"
 
 tests = [
@@ -80,10 +102,13 @@ def run_tests():
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T2.{tid}:", res2 == exp2, exp2, res2)
+            for name, solve in VARIANTS[2].items():
+                res2 = solve(inp)
+                print(f"T2.{tid}.{name}:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()[0]
+    lines = utils.load_input(anchor=__file__)[0]
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 337833
@@ -6,107 +6,37 @@
 
 import os
 import sys
-from typing import List, Tuple
+import functools
+from typing import List
 from functools import reduce
 
+import numpy as np
+
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc.grid import Grid
 
 DAY = '09'
 DEBUG = False
 
 
-class Board(object):
-
-    # Coordinate offsets to access points around another point
-    SIDES = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    CORNERS = [(-1, -1), (-1, +1), (+1, -1), (+1, +1)]
-
-    AROUND = sorted(SIDES)
-
-    @classmethod
-    def from_lines(cls, lines: List[str]):
-        rows = [list(map(int, line)) for line in lines]
-        return cls(rows)
-
-    def __init__(self, rows):
-        self.rows = rows
-
-    def dims(self):
-        return len(self.rows), len(self.rows[0])
-
-    def __getitem__(self, pos):
-        x, y = pos
-        if -1 < x < len(self.rows) and -1 < y < len(self.rows[x]):
-            return self.rows[x][y]
-        return None
-
-    def __setitem__(self, pos: Tuple[int, int], val):
-        x, y = pos
-        if self[x, y] is not None:
-            self.rows[x][y] = val
-
-    def __iter__(self):
-        return self.BoardIterator(self)
-
-    def __str__(self):
-        lines = ["".join(map(str, row)) for row in self.rows]
-        return "\n".join(lines)
-
-    def __len__(self):
-        """Total number of cells on the board"""
-        return len(self.rows) * len(self.rows[0])
-
-    def neighbors_of(self, xy):
-        x, y = xy
-        for dx, dy in self.AROUND:
-            nx, ny = x+dx, y+dy
-            val = self[nx, ny]
-            if val is not None:
-                yield((nx, ny), val)
-
-    class BoardIterator(object):
-
-        def __init__(self, brd):
-            self.board = brd
-            self.idx = -1
-            self.numrows, self.numcols = self.board.dims()
-
-        def __iter__(self):
-            return self
-
-        def __next__(self):
-            self.idx += 1
-            if self.idx < (self.numrows * self.numcols):
-                x = int(self.idx / self.numcols)
-                y = int(self.idx % self.numcols)
-                return (x, y), self.board[x, y]
-            raise StopIteration
-
-
-def find_lowest_points(heightmap):
-
-    def is_lowest(pt):
-        for npt in heightmap.neighbors_of(pt[0]):
-            if pt[1] >= npt[1]:
-                return False
-        return True
-
-    lowest_points = list(filter(is_lowest, heightmap))
-    return lowest_points
+def find_lowest_points(heightmap: Grid) -> List[int]:
+    """Return flat indices of the points that are lower than all neighbors"""
+    lowest = heightmap.cells < heightmap.around(np.minimum, fill=10)
+    return np.flatnonzero(lowest).tolist()
 
 
 def solve_p1(lines: List[str]) -> int:
     """Solution to the 1st part of the challenge"""
-    heightmap = Board.from_lines(lines)
+    heightmap = Grid.from_lines(lines)
 
-    lowest_points = find_lowest_points(heightmap)
-    risk = sum(pt[1] + 1 for pt in lowest_points)
+    heights = heightmap.flat
+    risk = sum(int(heights[pt]) + 1 for pt in find_lowest_points(heightmap))
 
     return risk
 
 
-def find_basin(heightmap, lowest):
+def find_basin(heights: List[int], neighbors: List[List[int]], lowest: int):
     basin = {lowest}
 
     seen_pts = set()
@@ -114,27 +44,27 @@ def find_basin(heightmap, lowest):
     while pts:
         for _ in range(len(pts)):
             pt = pts.pop(0)
-            for npt in heightmap.neighbors_of(pt[0]):
+            for npt in neighbors[pt]:
                 if npt in seen_pts:
                     continue
                 seen_pts.add(npt)
 
-                if lowest[1] <= npt[1] < 9:
+                if heights[lowest] <= heights[npt] < 9:
                     pts.append(npt)
                     basin.add(npt)
 
     return basin
 
 
-def find_basin2(heightmap, lowest):
+def find_basin2(heights: List[int], neighbors: List[List[int]], lowest: int):
     """Recursive implementation"""
 
     def fill_basin(pt, basin, seen_points):
-        for npt in heightmap.neighbors_of(pt[0]):
+        for npt in neighbors[pt]:
             if npt in seen_points:
                 continue
             seen_points.add(npt)
-            if lowest[1] <= npt[1] < 9:
+            if heights[lowest] <= heights[npt] < 9:
                 basin.append(npt)
                 fill_basin(npt, basin, seen_points)
 
@@ -146,14 +76,16 @@ def find_basin2(heightmap, lowest):
 
 def solve_p2(lines: List[str], version=1) -> int:
     """Solution to the 2nd part of the challenge"""
-    heightmap = Board.from_lines(lines)
+    heightmap = Grid.from_lines(lines)
+    heights = heightmap.flat.tolist()
+    neighbors = heightmap.neighbor_lists(4)
 
     sizes = []
     for pt in find_lowest_points(heightmap):
         if version == 1:
-            basin = find_basin(heightmap, pt)
+            basin = find_basin(heights, neighbors, pt)
         elif version == 2:
-            basin = find_basin2(heightmap, pt)
+            basin = find_basin2(heights, neighbors, pt)
         sizes.append(len(basin))
 
     area3 = reduce(lambda a, b: a*b, sorted(sizes)[-3:], 1)
@@ -161,6 +93,14 @@ def solve_p2(lines: List[str], version=1) -> int:
     return area3
 
 
+VARIANTS = {
+    2: {
+        'bfs': solve_p2,
+        'recursive': functools.partial(solve_p2, version=2),
+    },
+}
+
+
 text_1 = """\
 2199943210
 3987894921
@@ -185,14 +125,13 @@ def run_tests():
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T2.{tid}:", res2 == exp2, exp2, res2)
-
-        if exp2 is not None:
-            res2 = solve_p2(inp, 2)
-            print(f"T2.{tid}.v2:", res2 == exp2, exp2, res2)
+            for name, solve in VARIANTS[2].items():
+                res2 = solve(inp)
+                print(f"T2.{tid}.{name}:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 537
@@ -6,12 +6,16 @@
 
 import os
 import sys
+import heapq
+import operator
 
-from typing import List, Tuple, Union
+from typing import List, Tuple, Union, Optional
 from functools import reduce
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import incremental
+from aoc import parallel
 
 DAY = '10'
 DEBUG = False
@@ -71,6 +75,10 @@ def analyse(record: str) -> Tuple[str, Stack]:
     return bad, st
 
 
+def completion_score(st: Stack) -> int:
+    return reduce(lambda a, b: a*5+SCORES[b][1], st.items, 0)
+
+
 def solve_p1(lines: List[str]) -> int:
     """Solution to the 1st part of the challenge"""
     score = 0
@@ -81,23 +89,85 @@ def solve_p1(lines: List[str]) -> int:
     return score
 
 
-def solve_p2(lines: List[str]) -> int:
-    """Solution to the 2nd part of the challenge"""
+def completion_scores(lines: List[str]) -> List[int]:
+    """Completion scores of incomplete lines"""
     scores = []
     for line in lines:
         imbalanced, st = analyse(line)
         if not imbalanced and st:
-            score = reduce(lambda a, b: a*5+SCORES[b][1], st.items, 0)
+            score = completion_score(st)
             # print(res, score)
             scores.append(score)
+    return scores
 
-    scores.sort()
 
+def middle_score(scores: List[int]) -> int:
+    scores.sort()
     return scores[int(len(scores) / 2)]
 
 
+def solve_p2(lines: List[str]) -> int:
+    """Solution to the 2nd part of the challenge"""
+    return middle_score(completion_scores(lines))
+
+
+class SyntaxErrorScore(incremental.Solver):
+    """Incremental version of solve_p1"""
+
+    def __init__(self):
+        self.score = 0
+
+    def feed(self, line: str):
+        imbalanced, _ = analyse(line.strip())
+        if imbalanced:
+            self.score += SCORES[imbalanced][0]
+
+    def answer(self) -> int:
+        return self.score
+
+
+class MiddleCompletionScore(incremental.Solver):
+    """Incremental version of solve_p2. The median of the scores is kept
+    between two heaps: <lower> (a max-heap, by negated scores) holds the
+    smaller half of the scores and <upper> (a min-heap) the larger half and
+    the median, which is then the smallest item of <upper>. Adding a score
+    takes O(log n)."""
+
+    def __init__(self):
+        self.lower = []
+        self.upper = []
+
+    def feed(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+        imbalanced, st = analyse(line)
+        if imbalanced or not st:
+            return
+        score = completion_score(st)
+        if self.upper and score < self.upper[0]:
+            score = -heapq.heappushpop(self.lower, -score)
+        heapq.heappush(self.upper, score)
+        # upper must have the same number of items as lower or one more
+        if len(self.upper) > len(self.lower) + 1:
+            heapq.heappush(self.lower, -heapq.heappop(self.upper))
+
+    def answer(self) -> Optional[int]:
+        return self.upper[0] if self.upper else None
+
+
+INCREMENTAL = {1: SyntaxErrorScore, 2: MiddleCompletionScore}
+
+# the score of part 1 is a sum over lines, solve_p1 scores a chunk as well
+PARALLEL = {
+    1: parallel.MapReduce(solve_p1, operator.add),
+    2: parallel.MapReduce(completion_scores, operator.add,
+                          finish=middle_score),
+}
+
+
 tests = [
-    (utils.load_input('test.1.txt'), 6+57+1197+25137, 288957),
+    (utils.lazy_input('test.1.txt', __file__), 6+57+1197+25137, 288957),
     (["<{([{{}}[<[[[<>{}]]]>[]]"], 0, 294),
     (["[({(<(())[]>[[{[]{<()<>>"], 0, 288957)
 ]
@@ -110,14 +180,22 @@ def run_tests():
         if exp1 is not None:
             res1 = solve_p1(inp)
             print(f"T1.{tid}:", res1 == exp1, exp1, res1)
+            res1 = SyntaxErrorScore().feed_lines(inp).answer()
+            print(f"T1.{tid}.inc:", res1 == exp1, exp1, res1)
+            res1 = PARALLEL[1].run_lines(inp, 3)
+            print(f"T1.{tid}.par:", res1 == exp1, exp1, res1)
 
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T2.{tid}:", res2 == exp2, exp2, res2)
+            res2 = MiddleCompletionScore().feed_lines(inp).answer()
+            print(f"T2.{tid}.inc:", res2 == exp2, exp2, res2)
+            res2 = PARALLEL[2].run_lines(inp, 3)
+            print(f"T2.{tid}.par:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 442131
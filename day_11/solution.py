@@ -9,71 +9,48 @@ import os
 import sys
 from typing import List
 
+import numpy as np
+
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
-from day_09.solution import Board
+from aoc.grid import Grid
 
 DAY = '11'
 DEBUG = False
 
-Board.AROUND = Board.SIDES + Board.CORNERS
-assert len(set(Board.AROUND)) == 8,  "Wrong number of neighbor coordinates"
-
-
-def flash_octopus(octopuses: Board, current, flashed_octopuses):
-
-    pos, energy = current
-
-    if energy < 10 or pos in flashed_octopuses:
-        return 0
-
-    if DEBUG:
-        print("Flashes", current)
-
-    # current octopus flashes and gets discharged
-    octopuses[pos] = 0
-    c_flashed = 1
-
-    flashed_octopuses.append(pos)
-
-    # flashing charges neighboring octopuses
-    for neigh in octopuses.neighbors_of(pos):
-        if neigh[0] not in flashed_octopuses:
-            octopuses[neigh[0]] += 1
 
-    # some neighbors can also flash
-    for neigh in octopuses.neighbors_of(pos):
-        if neigh[0] in flashed_octopuses:
-            continue
-        if neigh[1] > 9:
-            c_flashed += flash_octopus(octopuses, neigh, flashed_octopuses)
-
-    return c_flashed
-
-
-def tick(octopuses: Board):
+def tick(octopuses: Grid):
     """what happens at a single moment in time, kinda simulateneously"""
 
-    c_flashes = 0
+    energy = octopuses.cells
 
     # update all by 1
-    for coord, energy in octopuses:
-        octopuses[coord] += 1
+    energy += 1
 
     if DEBUG:
         print("--- after + 1 ---")
         print(octopuses)
 
-    flashed = []
-    for octo in octopuses:
-        c_flashes += flash_octopus(octopuses, octo, flashed)
+    # flashing charges neighboring octopuses, some of them flash in turn.
+    # every octopus flashes at most once.
+    flashed = np.zeros(energy.shape, dtype=bool)
+    flashing = energy > 9
+    while flashing.any():
+        if DEBUG:
+            print("Flashes", np.argwhere(flashing).tolist())
+        flashed |= flashing
+        energy += octopuses.around(np.add, flashing.view(np.uint8), 8)
+        flashing = (energy > 9) & ~flashed
 
-    return c_flashes
+    # flashed octopuses get discharged
+    energy[flashed] = 0
+
+    return int(np.count_nonzero(flashed))
 
 
 def solve_p1(lines: List[str], steps=1) -> int:
     """Solution to the 1st part of the challenge"""
-    cavern = Board.from_lines(lines)
+    cavern = Grid.from_lines(lines)
 
     if DEBUG:
         print("--- Before ---")
@@ -93,13 +70,18 @@ def solve_p1(lines: List[str], steps=1) -> int:
 
 def solve_p2(lines: List[str]) -> int:
     """Solution to the 2nd part of the challenge"""
-    cavern = Board.from_lines(lines)
+    cavern = Grid.from_lines(lines)
     c_steps = 1
     while tick(cavern) != len(cavern):
         c_steps += 1
     return c_steps
 
 
+def prepare_input(lines: List[str], part: int) -> tuple:
+    """Part 1 runs for 100 steps"""
+    return (lines, 100) if part == 1 else (lines,)
+
+
 text_1 = """11111
 19991
 19191
@@ -110,8 +92,8 @@ text_1 = """11111
 
 tests = [
     ((text_1.split('\n'), 2), 9, None),
-    ((utils.load_input('test.2.txt'), 10), 204, 195),
-    ((utils.load_input('test.2.txt'), 100), 1656, None)
+    ((utils.lazy_input('test.2.txt', __file__), 10), 204, 195),
+    ((utils.lazy_input('test.2.txt', __file__), 100), 1656, None)
 ]
 
 
@@ -129,7 +111,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 1729
@@ -38,6 +38,8 @@ class GraphPathException(Exception):
 class GPath(object):
     """A path through the graph as a list of nodes"""
 
+    __slots__ = ('nodes',)
+
     def __init__(self, src = None):
         self.nodes = []
         if isinstance(src, list):
@@ -68,6 +70,8 @@ class GPath(object):
 
 class GPath2(GPath):
 
+    __slots__ = ('counts', 'most_visits')
+
     def __init__(self, *args):
         super().__init__(*args)
         self.counts = defaultdict(int)
@@ -133,9 +137,9 @@ def solve_p2(lines: List[str]) -> int:
 
 
 tests = [
-    (utils.load_input('test.1.txt'), 10, 36),
-    (utils.load_input('test.2.txt'), 19, 103),
-    (utils.load_input('test.3.txt'), 226, 3509),
+    (utils.lazy_input('test.1.txt', __file__), 10, 36),
+    (utils.lazy_input('test.2.txt', __file__), 19, 103),
+    (utils.lazy_input('test.3.txt', __file__), 226, 3509),
 ]
 
 
@@ -153,7 +157,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 4691
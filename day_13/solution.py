@@ -11,10 +11,12 @@ from typing import List
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import cache
 
 DAY = '13'
 DEBUG = False
 
+@cache.parsed(version=1)
 def parse_input(lines: List[str]):
     dots = {}
     commands = []
@@ -108,7 +110,7 @@ def solve_p2(lines: List[str]) -> int:
 
 
 tests = [
-    (utils.load_input('test.1.txt'), 17, 16),
+    (utils.lazy_input('test.1.txt', __file__), 17, 16),
 ]
 
 
@@ -126,7 +128,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 814
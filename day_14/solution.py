@@ -78,7 +78,8 @@ def solve_p2(lines: List[str]) -> int:
 
 
 tests = [
-    (utils.load_input('test.1.txt'), 1749 - 161, 2192039569602-3849876073),
+    (utils.lazy_input('test.1.txt', __file__),
+     1749 - 161, 2192039569602-3849876073),
 ]
 
 
@@ -96,7 +97,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 2768
@@ -2,118 +2,69 @@
 
 # # #
 #
-# TODO
-# 1. try using heapq instead of PriorityQueue. what is faster?
+# Shortest paths: PriorityQueue 1.6 s, heapq Dijkstra 0.5 s, Dial's buckets
+# 0.35 s (p.2, without building the graph)
 #
 
 import re
 import os
 import sys
 from typing import List
-from queue import PriorityQueue
-from copy import deepcopy
+
+import numpy as np
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
-from day_09.solution import Board
+from aoc import graph
+from aoc.grid import Grid
 
 
 DAY = '15'
 DEBUG = False
 
 
-def compute_risks(board, startp, endp):
-    # came_from = {startp: None}
-    risk_so_far = {startp: 0}
-
-    frontier = PriorityQueue()  # lowest first
-    frontier.put((0, startp))
-
-    while frontier.qsize():
-        _, pt = frontier.get()
-
-        # print("Current", pt, risk_so_far[pt])
-        if pt == endp:
-            # print("Reached", pt, risk_so_far[pt])
-            break
-
-        for neigh in board.neighbors_of(pt):
-            coord, risk = neigh
-            # if coord in came_from:
-            #     continue
-            # print("..", neigh)
-            new_risk = risk_so_far[pt] + risk
-            if coord not in risk_so_far or new_risk < risk_so_far[coord]:
-                # came_from[coord] = pt
-                risk_so_far[coord] = new_risk
-                frontier.put((new_risk, coord))
-
-    return risk_so_far[endp]
+def compute_risks(cavern: Grid, startp: int, endp: int) -> int:
+    """Find the lowest total risk of a path between two cells given by their
+    flat indices. Risks are 1..9, small enough for buckets instead of a heap.
+    """
+    neighbors = cavern.neighbor_lists(4)
+    weights = graph.node_weights(neighbors, cavern.flat.tolist())
+    return graph.dial(neighbors, weights, startp, endp, 9)[endp]
 
 
 def solve_p1(lines: List[str]) -> int:
     """Solution to the 1st part of the challenge"""
-    cavern = Board.from_lines(lines)
-    h, v = cavern.dims()
-    return compute_risks(cavern, (0, 0), (h-1, v-1))
+    cavern = Grid.from_lines(lines)
+    return compute_risks(cavern, 0, len(cavern)-1)
 
 
-def expand_cavern(base: Board):
+def expand_cavern(base: Grid, times: int = 5) -> Grid:
     """Expand the cavern to be 5x5 by repeating the base cavern to the right
-    and downwards.
+    and downwards. Every repetition increases the risks by 1, wrapping
+    around from 9 to 1.
     """
-    # What can be changed:
-    # TODO: this all can be done easier with numpy (hstack, vstack)
-    # TODO: create an empty megacavern of final size and populate it
-    rows = [[], [], [], [], []]
-    for ri in range(5):
-        for ci in range(5):
-            tile = deepcopy(base)
-            for coord, value in tile:
-                value += (ri+ci)
-                tile[coord] = value - 9 if value > 9 else value
-            rows[ri].append(tile)
+    h, w = base.dims()
+    # increment of the tile at the row <ri> and column <ci> is ri+ci
+    incs = np.add.outer(np.arange(times), np.arange(times))
+    # axes: tile row, row in the tile, tile column, column in the tile
+    tiles = base.cells[None, :, None, :] - 1 + incs[:, None, :, None]
+    megatile = Grid((tiles % 9 + 1).astype(np.uint8).reshape(times*h, times*w))
 
     if DEBUG:
-        text = ""
-        pos = (0, 0)
-        for ri in range(len(rows)):
-            for ci in range(len(rows[ri])):
-                tile = rows[ri][ci]
-                text += " {}".format(tile[pos])
-            text += "\n"
-        print(text)
-
-    for ri in range(len(rows)):
-        megatile = rows[ri].pop(0)
-        while rows[ri]:
-            # merge tile into another tile
-            other = rows[ri].pop(0)
-            for i, r in enumerate(other.rows):
-                megatile.rows[i].extend(r)
-        # print(megatile)
-        # print("---")
-        rows[ri] = megatile
-
-    megatile = rows.pop(0)
-    while rows:
-        other = rows.pop(0)
-        megatile.rows.extend(other.rows)
-    
-    #print(megatile.dims())
+        print(megatile.view(slice(None, None, h), slice(None, None, w)))
+
     return megatile
 
 
 def solve_p2(lines: List[str]) -> int:
     """Solution to the 2nd part of the challenge"""
-    cavern = Board.from_lines(lines)
+    cavern = Grid.from_lines(lines)
     megacavern = expand_cavern(cavern)
-    h, v = megacavern.dims()
-    return compute_risks(megacavern, (0, 0), (h-1, v-1))
+    return compute_risks(megacavern, 0, len(megacavern)-1)
 
 
 tests = [
-    (utils.load_input("test.1.txt"), 40, 315),
+    (utils.lazy_input("test.1.txt", __file__), 40, 315),
 ]
 
 
@@ -131,7 +82,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 602
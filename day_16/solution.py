@@ -198,6 +198,11 @@ def solve_p2(line: str) -> int:
     return evaluate(packet)
 
 
+def prepare_input(lines: List[str], part: int) -> tuple:
+    """The solutions take the only line of the input"""
+    return (lines[0],)
+
+
 text_1 = "D2FE28"
 text_2 = "38006F45291200"
 text_3 = "EE00D40C823060"
@@ -243,7 +248,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()[0]
+    lines = utils.load_input(anchor=__file__)[0]
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 920
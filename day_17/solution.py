@@ -11,6 +11,8 @@ from typing import List, Tuple, Generator
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import spans
+from aoc import metrics
 
 DAY = '17'
 DEBUG = int(os.environ.get('DEBUG', 0))
@@ -45,6 +47,8 @@ class TargetArea(object):
 
 class Probe(object):
 
+    __slots__ = ('x', 'y', 'vx', 'vy', 'maxy', 'time')
+
     def __init__(self, vx, vy):
         self.x, self.y = (0, 0)
         self.vx = int(vx)  # horizontal velocity
@@ -82,7 +86,7 @@ class Probe(object):
 
 
 def test_target_area():
-    line = utils.load_input('test.1.txt')[0]
+    line = utils.load_input('test.1.txt', __file__)[0]
     area = TargetArea.from_text(line)
 
     hits = [(21,-9), (20, -9),
@@ -183,7 +187,7 @@ def velocities_p2_1(area) -> Generator[T_VELOCIY, None, None]:
             yield vx, vy
 
 
-@utils.mytimeit
+@spans.timed
 def run_simulations(area, velocities) -> Tuple[Probe, int]:
     """Lauch probes for each of the initial velocities from <velocities> and
     return best probe (for part 1) as well as the total number of probes that
@@ -192,10 +196,12 @@ def run_simulations(area, velocities) -> Tuple[Probe, int]:
     best = None
     c_probes = 0
     c_successful_probes = 0
+    c_steps = 0
     for vx, vy in velocities():
         c_probes += 1
         probe = Probe(vx, vy)
         success = launch(probe, area)
+        c_steps += probe.time
         if success:
             c_successful_probes += 1
             if DEBUG > 1:
@@ -203,6 +209,9 @@ def run_simulations(area, velocities) -> Tuple[Probe, int]:
                     (vx,vy), probe.max_altitude))
             if not best or best.max_altitude < probe.max_altitude:
                 best = probe
+    metrics.counter('probes').inc(c_probes)
+    metrics.counter('probes hit').inc(c_successful_probes)
+    metrics.counter('probe steps').inc(c_steps)
     if DEBUG > 0:
         print("Probes total/successful: {}/{}".format(
             c_probes, c_successful_probes))
@@ -224,7 +233,7 @@ def solve_p2(lines: List[str]) -> int:
 
 
 tests = [
-    (utils.load_input('test.1.txt'), 45, 112),
+    (utils.lazy_input('test.1.txt', __file__), 45, 112),
 ]
 
 
@@ -242,7 +251,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 4095
@@ -13,13 +13,15 @@ from itertools import combinations
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import spans
+from aoc import metrics
 
 DAY = '18'
 DEBUG = int(os.environ.get('DEBUG', 0))
 
 
 tests = [
-    (utils.load_input('test.1.txt'), 4140, 3993),
+    (utils.lazy_input('test.1.txt', __file__), 4140, 3993),
 ]
 
 
@@ -35,6 +37,8 @@ class RN(object):
     SN.from_string()
     """
 
+    __slots__ = ('value', 'parent', 'position')
+
     def __init__(self, value):
         self.value = int(value)
         self.parent = None
@@ -87,6 +91,8 @@ class RN(object):
 class SN(object):
     """Snailfish Number"""
 
+    __slots__ = ('args', 'parent', 'position', 'start', 'end')
+
     # This is used in testing only
     ALLOW_LONG_NUMBERS = False
 
@@ -223,7 +229,9 @@ class SN(object):
             right_neighbor += self.right
         self.parent[self.position] = RN(0)
 
+    @spans.timed
     def reduce(self):
+        explodes = splits = 0
         changed = True
         while changed:
             changed = False
@@ -236,10 +244,15 @@ class SN(object):
 
             changed = self._do_explode()
             if changed:
+                explodes += 1
                 continue
 
             changed = self._do_split()
+            splits += changed
 
+        metrics.counter('explodes').inc(explodes)
+        metrics.counter('splits').inc(splits)
+        metrics.histogram('reduce steps').observe(explodes + splits)
         return self
 
     def _do_explode(self) -> bool:
@@ -347,7 +360,7 @@ def test_sn_parsing():
     and expect serialization to be equal to the source string."""
     print("--- Parsing a string into Snailfish Number ---")
     lines = tests[0][0]
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
     counts = [0, 0]
     for line in lines:
         sn = SN.from_string(line)
@@ -395,7 +408,7 @@ def test_sn_sum():
         (["[1,1]", "[2,2]", "[3,3]", "[4,4]", "[5,5]", "[6,6]"],
           "[[[[5,0],[7,4]],[5,5]],[6,6]]"),
 
-        (utils.load_input('test.2.txt'),
+        (utils.load_input('test.2.txt', __file__),
          "[[[[8,7],[7,7]],[[8,6],[7,7]]],[[[0,7],[6,6]],[8,7]]]")
     ]
     for idx, (lines, exp) in enumerate(tests):
@@ -457,7 +470,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 3574
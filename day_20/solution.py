@@ -6,10 +6,12 @@
 
 import os
 import sys
+import functools
 from typing import List, Union
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from aoc import utils
+from aoc import metrics
 
 
 DAY = '20'
@@ -67,6 +69,11 @@ class ImageEnhancementAlgorithm(object):
         # update outside pixel (InfinitePixel)
         image.outside_pixel = next(image.outside_pixel)
 
+        # one recode per pixel of the padded image and one more for the
+        # outside pixel
+        metrics.counter('recode').inc(len(image) + 1)
+        metrics.histogram('changed pixels').observe(len(new_pixel_values))
+
         if DEBUG > 1:
             print("Number of updated pixels", len(new_pixel_values))
             image.inspect("Enhanced image")
@@ -74,6 +81,8 @@ class ImageEnhancementAlgorithm(object):
 
 class Pixel(object):
 
+    __slots__ = ('value',)
+
     VALUES = {'.': 0, '#': 1}
 
     def __init__(self, value: Union[str, 'Pixel'] = '.'):
@@ -104,6 +113,8 @@ class Pixel(object):
 class InfinityPixel(Pixel):
     """A special kind of pixel that knows how it should change in the next step"""
 
+    __slots__ = ('changer',)
+
     def __init__(self, initial_value, changer):
         super().__init__(initial_value)
         self.changer = changer
@@ -135,7 +146,6 @@ class Image(object):
         self.pixels = pixels
         self.outside_pixel = None
         self._set_spans()
-        # self._strides = {}
 
     def __iter__(self):
         pixels = list(self.pixels.items())
@@ -155,19 +165,6 @@ class Image(object):
         self.xspan = [xs[0], xs[-1]]
         self.yspan = [ys[0], ys[-1]]
 
-    # def get_stride2(self, xy) -> List[Pixel]:
-    #     """Return pixels in the 3x3 window around the position <xy>.
-    #     This method maintains a cache of answers of the form
-    #       strides[xy] = [(x1, y1), (x2,y2), ..., (x9, y9)]
-    #     It turns out that this approach makes performance worse.
-    #     """
-    #     if xy not in self._strides:
-    #         x, y = xy
-    #         self._strides[xy] = [(x+dx, y+dy) for dx, dy in self.STRIDE]
-    #     stride = [self.pixels.get(_xy, self.outside_pixel)
-    #                 for _xy in self._strides[xy]]
-    #     return stride
-
     def get_stride(self, xy) -> List[Pixel]:
         """Return pixels in the 3x3 window around the position <xy>"""
         x, y = xy
@@ -218,15 +215,35 @@ class Image(object):
         print(str(self))
 
 
+class CachedStrideImage(Image):
+    """Image that maintains a cache of positions in the 3x3 window around
+    every pixel, of the form
+      strides[xy] = [(x1, y1), (x2,y2), ..., (x9, y9)]
+    It turns out that this approach makes performance worse.
+    """
+
+    def __init__(self, pixels):
+        super().__init__(pixels)
+        self._strides = {}
+
+    def get_stride(self, xy) -> List[Pixel]:
+        if xy not in self._strides:
+            x, y = xy
+            self._strides[xy] = [(x+dx, y+dy) for dx, dy in self.STRIDE]
+        stride = [self.pixels.get(_xy, self.outside_pixel)
+                    for _xy in self._strides[xy]]
+        return stride
+
+
 def test_iea_1():
-    data = utils.load_input("test.1.txt")[0]
-    # data = utils.load_input("input.txt")[0]
+    data = utils.load_input("test.1.txt", __file__)[0]
+    # data = utils.load_input("input.txt", __file__)[0]
     algo = ImageEnhancementAlgorithm(data)
     algo.show_table()
 
 
 def test_iea_2():
-    data = utils.load_input("test.1.txt")[0]
+    data = utils.load_input("test.1.txt", __file__)[0]
     algo = ImageEnhancementAlgorithm(data)
     tests = [(".........", ".")]
     for input, exp in tests:
@@ -261,7 +278,7 @@ def test_pixel():
 
 
 def test_infinity_pixel():
-    data = utils.load_input("input.txt")[0]
+    data = utils.load_input("input.txt", __file__)[0]
     algo = ImageEnhancementAlgorithm(data)
     pixel = InfinityPixel(".", algo)
     exp = [".", "#", ".", "#", ".", "#"]
@@ -280,15 +297,15 @@ def test_infinity_pixel():
 # exit(100)
 
 
-def parse_input(lines: List[str]):
+def parse_input(lines: List[str], image_class=Image):
     algo = ImageEnhancementAlgorithm(lines[0])
-    image = Image.from_lines(lines[2:])
+    image = image_class.from_lines(lines[2:])
     return algo, image
 
 
-def solve_p1(lines: List[str], times=2) -> int:
+def solve_p1(lines: List[str], times=2, image_class=Image) -> int:
     """Solution to the 1st part of the challenge"""
-    algo, image = parse_input(lines)
+    algo, image = parse_input(lines, image_class)
     image.outside_pixel = InfinityPixel(".", algo)
 
     if DEBUG:
@@ -303,13 +320,23 @@ def solve_p1(lines: List[str], times=2) -> int:
     return image.count_lit_pixels()
 
 
-def solve_p2(lines: List[str]) -> int:
+def solve_p2(lines: List[str], image_class=Image) -> int:
     """Solution to the 2nd part of the challenge"""
-    return solve_p1(lines, 50)
+    return solve_p1(lines, 50, image_class)
+
+
+VARIANTS = {
+    part: {
+        'stride': solve,
+        'cached-stride': functools.partial(solve,
+                                           image_class=CachedStrideImage),
+    }
+    for part, solve in ((1, solve_p1), (2, solve_p2))
+}
 
 
 tests = [
-   (utils.load_input('test.1.txt'), 35, 3351),
+   (utils.lazy_input('test.1.txt', __file__), 35, 3351),
 ]
 
 
@@ -320,14 +347,20 @@ def run_tests():
         if exp1 is not None:
             res1 = solve_p1(inp)
             print(f"T.{tid}.p1:", res1 == exp1, exp1, res1)
+            for name, solve in VARIANTS[1].items():
+                res1 = solve(inp)
+                print(f"T.{tid}.p1.{name}:", res1 == exp1, exp1, res1)
 
         if exp2 is not None:
             res2 = solve_p2(inp)
             print(f"T.{tid}.p2:", res2 == exp2, exp2, res2)
+            for name, solve in VARIANTS[2].items():
+                res2 = solve(inp)
+                print(f"T.{tid}.p2.{name}:", res2 == exp2, exp2, res2)
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 4873
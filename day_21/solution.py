@@ -18,6 +18,8 @@ DEBUG = int(os.environ.get('DEBUG', 0))
 
 class DeterministicDie(object):
 
+    __slots__ = ('min', 'max', 'value', 'times')
+
     def __init__(self):
         self.min = 1
         self.max = 100
@@ -75,6 +77,13 @@ def solve_p2(lines: List[str]) -> int:
     return 0
 
 
+def prepare_input(lines: List[str], part: int) -> tuple:
+    """Part 1 takes starting positions of the players"""
+    if part == 1:
+        return tuple(int(line.split(':')[1]) for line in lines if line)
+    return (lines,)
+
+
 tests = [
     ((4, 8), 745 * 993, 444356092776315)
 ]
@@ -94,7 +103,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = 679329
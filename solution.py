@@ -31,7 +31,7 @@ def solve_p2(lines: List[str]) -> int:
 
 
 tests = [
-    # (utils.load_input('test.1.txt'), exp1, exp2),
+    # (utils.lazy_input('test.1.txt', __file__), exp1, exp2),
     # TODO
 ]
 
@@ -50,7 +50,7 @@ def run_tests():
 
 
 def run_real():
-    lines = utils.load_input()
+    lines = utils.load_input(anchor=__file__)
 
     print(f"--- Day {DAY} p.1 ---")
     exp1 = -1